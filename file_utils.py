@@ -0,0 +1,32 @@
+import os
+import json
+import pathlib
+import tempfile
+
+CACHE_DIR = pathlib.Path(
+    os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+) / "linux-wallpaperengine-gui"
+RUNTIME_DIR = pathlib.Path(
+    os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+) / "linux-wallpaperengine-gui"
+
+PROC_ROOT = "/proc"
+
+
+def read_file(path, binary=False):
+    """Return the whole contents of a small file such as a /proc entry."""
+    with open(path, "rb" if binary else "r") as f:
+        return f.read()
+
+
+def write_json_atomic(path, payload):
+    """Write payload as JSON to path through a temporary file.
+
+    Readers see either the old file or the complete new one, never a
+    partial write. Errors are left to the caller.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,140 @@
+import os
+import time
+import logging
+
+from file_utils import PROC_ROOT, read_file
+
+SYSFS_ROOT = "/sys"
+GOVERNOR_INTERVAL = 10.0
+BACKEND_DEFAULT_FPS = 30
+
+DEFAULT_TIERS = {
+    # FPS cap while running on battery
+    "battery": 15,
+    # FPS cap while the system is busy (load average per CPU is high)
+    "busy": 20,
+    # FPS cap while the backend itself uses a lot of CPU
+    "heavy": 24,
+}
+
+# Enter/exit thresholds; the gap between them is the hysteresis band.
+BUSY_ENTER = 0.85
+BUSY_EXIT = 0.6
+HEAVY_ENTER = 50.0
+HEAVY_EXIT = 30.0
+# Load and CPU states must hold for this many evaluations before they count
+DWELL = 2
+
+
+def read_power_source(sysfs_root=SYSFS_ROOT):
+    """Return "ac", "battery" or None when there is no power supply info."""
+    base = os.path.join(sysfs_root, "class", "power_supply")
+    try:
+        supplies = os.listdir(base)
+    except OSError:
+        return None
+    has_battery = False
+    for name in supplies:
+        try:
+            kind = read_file(os.path.join(base, name, "type")).strip()
+            if kind == "Battery":
+                has_battery = True
+            elif kind in ("Mains", "USB", "USB_C", "USB_PD"):
+                if read_file(os.path.join(base, name, "online")).strip() == "1":
+                    return "ac"
+        except OSError:
+            continue
+    return "battery" if has_battery else None
+
+
+def read_load_per_cpu(proc_root=PROC_ROOT):
+    try:
+        load = float(read_file(os.path.join(proc_root, "loadavg")).split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return load / (os.cpu_count() or 1)
+
+
+def command_fps(cmd):
+    if "--fps" in cmd:
+        i = cmd.index("--fps")
+        try:
+            return int(cmd[i + 1])
+        except (IndexError, ValueError):
+            pass
+    return BACKEND_DEFAULT_FPS
+
+
+def with_fps(cmd, fps):
+    """Return cmd with its frame rate capped at fps."""
+    if fps is None or fps >= command_fps(cmd):
+        return list(cmd)
+    cmd = list(cmd)
+    if "--fps" in cmd:
+        cmd[cmd.index("--fps") + 1] = str(fps)
+    else:
+        cmd.extend(["--fps", str(fps)])
+    return cmd
+
+
+class FpsGovernor:
+    """Picks an FPS cap from the power source, system load and backend cost.
+
+    Each active condition maps to a tier; the lowest tier wins. Load and
+    backend CPU use separate enter and exit thresholds and must persist for
+    DWELL evaluations, so the cap does not flap around a threshold.
+    """
+
+    def __init__(self, tiers=None, sysfs_root=SYSFS_ROOT, proc_root=PROC_ROOT):
+        self.tiers = dict(DEFAULT_TIERS)
+        self.tiers.update(tiers or {})
+        self.sysfs_root = sysfs_root
+        self.proc_root = proc_root
+        self.busy = False
+        self.heavy = False
+        self._pending = {"busy": 0, "heavy": 0}
+        self.cap = None
+        self.reasons = []
+        self.changed_at = None
+
+    def _settle(self, name, current, enter, leave):
+        # Count consecutive evaluations that disagree with the current state
+        flip = leave if current else enter
+        self._pending[name] = self._pending[name] + 1 if flip else 0
+        if self._pending[name] >= DWELL:
+            self._pending[name] = 0
+            return not current
+        return current
+
+    def evaluate(self, backend_cpu=None):
+        """Re-evaluate the cap; returns True if it changed.
+
+        backend_cpu is the backends' CPU use in percent of one core, scaled
+        to the FPS the user asked for so a capped backend is judged by what
+        it would cost uncapped.
+        """
+        power = read_power_source(self.sysfs_root)
+        load = read_load_per_cpu(self.proc_root)
+        if load is not None:
+            self.busy = self._settle("busy", self.busy, load >= BUSY_ENTER, load < BUSY_EXIT)
+        if backend_cpu is not None:
+            self.heavy = self._settle("heavy", self.heavy,
+                                      backend_cpu >= HEAVY_ENTER, backend_cpu < HEAVY_EXIT)
+
+        reasons = []
+        if power == "battery":
+            reasons.append("battery")
+        if self.busy:
+            reasons.append("busy")
+        if self.heavy:
+            reasons.append("heavy")
+        cap = min((self.tiers[r] for r in reasons), default=None)
+        if cap == self.cap:
+            self.reasons = reasons
+            return False
+        logging.info("FPS governor: cap %s -> %s (%s; load/cpu %s, backend %s%%)",
+                     self.cap, cap, ", ".join(reasons) or "no limits", load, backend_cpu)
+        self.cap = cap
+        self.reasons = reasons
+        self.changed_at = time.monotonic()
+        return True
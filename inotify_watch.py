@@ -0,0 +1,125 @@
+import os
+import errno
+import ctypes
+import ctypes.util
+import struct
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# Content and directory changes; opens, reads and closes without writing
+# are left out, since scanning an item would otherwise report itself.
+CHANGE_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+               IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+EVENT_HEADER = struct.Struct("iIII")
+READ_SIZE = 64 * 1024
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+
+def _error(what):
+    err = ctypes.get_errno()
+    if err == errno.EMFILE:
+        return OSError(err, "inotify instance limit reached")
+    if err == errno.ENOSPC:
+        return OSError(err, "inotify watch limit reached")
+    return OSError(err, f"{what}: {os.strerror(err)}")
+
+
+class Inotify:
+    """One non-blocking inotify instance holding any number of watches.
+
+    Every watch lives on the same file descriptor, so a library of any
+    size costs a single inotify instance; fd can be handed to a poller or
+    a QSocketNotifier and read_events() called when it becomes readable.
+    Raises OSError when inotify is unavailable or the instance limit is
+    reached.
+    """
+
+    def __init__(self):
+        try:
+            libc = _load_libc()
+        except (OSError, AttributeError) as e:
+            raise OSError(errno.ENOSYS, f"inotify not available: {e}")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd == -1:
+            raise _error("inotify_init1")
+        self.paths = {}
+        self.wds = {}
+
+    def add_watch(self, path, mask=CHANGE_MASK):
+        """Watch one directory, not its subdirectories; returns the descriptor."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd == -1:
+            raise _error(f"inotify_add_watch {path}")
+        self.paths[wd] = path
+        self.wds[path] = wd
+        return wd
+
+    def remove_watch(self, path):
+        wd = self.wds.pop(path, None)
+        if wd is None:
+            return
+        self.paths.pop(wd, None)
+        # Fails harmlessly when the directory (and so the watch) is gone
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self):
+        """Return (path, mask) for every queued event, without blocking."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                break
+            except InterruptedError:
+                continue
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                base = self.paths.get(wd)
+                if mask & IN_IGNORED:
+                    # The kernel dropped the watch, e.g. its directory was removed
+                    if base is not None:
+                        self.paths.pop(wd, None)
+                        self.wds.pop(base, None)
+                    continue
+                if base is None:
+                    continue
+                events.append((os.path.join(base, os.fsdecode(name)) if name else base, mask))
+        return events
+
+    def close(self):
+        if self.fd != -1:
+            os.close(self.fd)
+            self.fd = -1
+        self.paths.clear()
+        self.wds.clear()
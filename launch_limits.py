@@ -0,0 +1,178 @@
+import os
+import re
+import shutil
+import subprocess
+import logging
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# Built-in profiles; more can be defined under "limit_profiles" in the config.
+DEFAULT_PROFILES = {
+    "none": {},
+    "low": {"nice": 10, "ionice": "best-effort", "ionice_level": 7},
+    "background": {"nice": 19, "ionice": "idle", "cpu_quota": 50, "memory_max": "1G"},
+}
+
+IONICE_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+MEMORY_RE = re.compile(r"^\d+[KMGT]?$")
+
+_scope_probe = {}
+
+
+def parse_cpu_list(text):
+    """Parse a CPU list like "0-3,6" into a set of CPU numbers."""
+    cpus = set()
+    for part in str(text).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        first = int(first)
+        last = int(last) if last else first
+        if first < 0 or last < first:
+            raise ValueError(part)
+        cpus.update(range(first, last + 1))
+    return cpus
+
+
+def validate_limits(limits):
+    """Return (clean, problems) for a limits dict.
+
+    clean only holds the constraints that passed; problems describes the
+    ones that were dropped.
+    """
+    clean = {}
+    problems = []
+    nice = limits.get("nice")
+    if nice is not None:
+        if isinstance(nice, int) and -20 <= nice <= 19:
+            if nice < 0 and os.geteuid() != 0:
+                problems.append(f"nice {nice} needs root")
+            else:
+                clean["nice"] = nice
+        else:
+            problems.append(f"invalid nice level {nice!r}")
+    ionice = limits.get("ionice")
+    if ionice:
+        if ionice not in IONICE_CLASSES:
+            problems.append(f"invalid ionice class {ionice!r}")
+        elif ionice == "realtime" and os.geteuid() != 0:
+            problems.append("ionice realtime needs root")
+        else:
+            clean["ionice"] = ionice
+            level = limits.get("ionice_level")
+            if ionice != "idle" and level is not None:
+                if isinstance(level, int) and 0 <= level <= 7:
+                    clean["ionice_level"] = level
+                else:
+                    problems.append(f"invalid ionice level {level!r}")
+    cpus = limits.get("cpus")
+    if cpus:
+        try:
+            wanted = parse_cpu_list(cpus)
+            allowed = os.sched_getaffinity(0)
+            if not wanted or not wanted <= allowed:
+                problems.append(f"CPUs {cpus} not available")
+            else:
+                clean["cpus"] = ",".join(str(c) for c in sorted(wanted))
+        except ValueError:
+            problems.append(f"invalid CPU list {cpus!r}")
+    quota = limits.get("cpu_quota")
+    if quota is not None:
+        if isinstance(quota, (int, float)) and quota > 0:
+            clean["cpu_quota"] = quota
+        else:
+            problems.append(f"invalid CPU quota {quota!r}")
+    memory = limits.get("memory_max")
+    if memory is not None:
+        if MEMORY_RE.match(str(memory)):
+            clean["memory_max"] = str(memory)
+        else:
+            problems.append(f"invalid memory limit {memory!r}")
+    return clean, problems
+
+
+def delegated_controllers(cgroup_root=CGROUP_ROOT):
+    """Return the cgroup controllers the user's systemd instance may use."""
+    uid = os.getuid()
+    path = os.path.join(cgroup_root, "user.slice", f"user-{uid}.slice",
+                        f"user@{uid}.service", "cgroup.controllers")
+    try:
+        with open(path) as f:
+            return set(f.read().split())
+    except OSError:
+        return set()
+
+
+def user_scope_available():
+    """Return whether systemd user scopes work, or None until probed."""
+    return _scope_probe.get("ok")
+
+
+def probe_user_scope():
+    """Check once whether systemd-run can create transient user scopes.
+
+    This starts a process and can take seconds on a slow user bus, so it
+    has to run off the GUI thread; the result is cached.
+    """
+    if "ok" not in _scope_probe:
+        ok = False
+        if shutil.which("systemd-run"):
+            try:
+                result = subprocess.run(
+                    ["systemd-run", "--user", "--scope", "--quiet", "--", "true"],
+                    capture_output=True, timeout=5)
+                ok = result.returncode == 0
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logging.error("Failed to probe systemd user scopes: %s", e)
+        _scope_probe["ok"] = ok
+    return _scope_probe["ok"]
+
+
+def build_limit_prefix(limits, cgroup_root=CGROUP_ROOT):
+    """Turn a limits dict into a command prefix that applies them.
+
+    Every wrapper execs the next one, so the backend keeps the pid that
+    Popen returns. Returns (prefix, problems); constraints that cannot be
+    applied here are left out and explained in problems, so the backend
+    still starts with whatever could be applied.
+    """
+    limits, problems = validate_limits(limits)
+    prefix = []
+
+    quota = limits.get("cpu_quota")
+    memory = limits.get("memory_max")
+    if quota is not None or memory is not None:
+        needed = ({"cpu"} if quota is not None else set()) | ({"memory"} if memory is not None else set())
+        missing = needed - delegated_controllers(cgroup_root)
+        if missing:
+            problems.append(f"cgroup controllers not delegated: {', '.join(sorted(missing))}")
+        elif user_scope_available() is None:
+            # Launches go without a scope until probe_user_scope() answers
+            logging.info("systemd user scope check pending, launching without CPU/memory limits")
+        elif not user_scope_available():
+            problems.append("systemd user scopes unavailable")
+        else:
+            prefix += ["systemd-run", "--user", "--scope", "--quiet", "--collect"]
+            if quota is not None:
+                prefix += ["-p", f"CPUQuota={quota:g}%"]
+            if memory is not None:
+                prefix += ["-p", f"MemoryMax={memory}"]
+            prefix.append("--")
+
+    wrappers = []
+    if "nice" in limits:
+        wrappers.append(("nice", ["nice", "-n", str(limits["nice"])]))
+    if "ionice" in limits:
+        args = ["ionice", "-c", str(IONICE_CLASSES[limits["ionice"]])]
+        if "ionice_level" in limits:
+            args += ["-n", str(limits["ionice_level"])]
+        wrappers.append(("ionice", args))
+    if "cpus" in limits:
+        wrappers.append(("taskset", ["taskset", "-c", limits["cpus"]]))
+    for tool, args in wrappers:
+        if shutil.which(tool):
+            prefix += args
+        else:
+            problems.append(f"{tool} not found")
+    return prefix, problems
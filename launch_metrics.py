@@ -0,0 +1,138 @@
+import csv
+import json
+import time
+import logging
+import threading
+from bisect import bisect_left
+from collections import deque
+
+from file_utils import CACHE_DIR, write_json_atomic
+
+LAUNCH_HISTORY_FILE = CACHE_DIR / "launch_latency.json"
+LAUNCH_HISTORY_VERSION = 1
+RECENT_LAUNCHES = 100
+
+# Upper bucket edges in ms; anything slower lands in the overflow bucket
+BUCKET_EDGES_MS = (10, 20, 50, 100, 150, 200, 300, 500, 750, 1000,
+                   1500, 2000, 3000, 5000, 10000)
+
+# build: command assembly in the GUI, stop: replacing the previous backend,
+# spawn: Popen, first_output: first log line, ready: readiness marker,
+# total: click (or coalesced change) to wallpaper on screen.
+PHASES = ("build", "stop", "spawn", "first_output", "ready", "total")
+
+EXPORT_FIELDS = ("time", "screen", "wallpaper", "handoff", "timed_out",
+                 *(f"{phase}_ms" for phase in PHASES), "settings")
+
+
+class Histogram:
+    """Fixed-bucket latency histogram, small enough to persist as it is."""
+
+    def __init__(self, counts=None, maximum=0.0):
+        self.counts = list(counts) if counts else [0] * (len(BUCKET_EDGES_MS) + 1)
+        self.maximum = maximum
+
+    def add(self, ms):
+        self.counts[bisect_left(BUCKET_EDGES_MS, ms)] += 1
+        self.maximum = max(self.maximum, ms)
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    def percentile(self, q):
+        """Estimate the q-th percentile in ms, interpolating within its bucket."""
+        total = self.total
+        if not total:
+            return None
+        rank = q / 100 * total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = BUCKET_EDGES_MS[i - 1] if i else 0
+                upper = min(BUCKET_EDGES_MS[i] if i < len(BUCKET_EDGES_MS) else self.maximum,
+                            self.maximum)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.maximum
+
+
+class LaunchHistory:
+    """Per-phase launch latency histograms plus the most recent launches."""
+
+    def __init__(self, path=LAUNCH_HISTORY_FILE):
+        self.path = path
+        self.histograms = {phase: Histogram() for phase in PHASES}
+        self.recent = deque(maxlen=RECENT_LAUNCHES)
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.error("Failed to read launch history: %s", e)
+            return
+        if data.get("version") != LAUNCH_HISTORY_VERSION or data.get("edges") != list(BUCKET_EDGES_MS):
+            return
+        with self._lock:
+            for phase, hist in data.get("histograms", {}).items():
+                if phase in self.histograms:
+                    self.histograms[phase] = Histogram(hist["counts"], hist["max"])
+            self.recent.extend(data.get("recent", []))
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            payload = {
+                "version": LAUNCH_HISTORY_VERSION,
+                "edges": list(BUCKET_EDGES_MS),
+                "histograms": {phase: {"counts": h.counts, "max": h.maximum}
+                               for phase, h in self.histograms.items()},
+                "recent": list(self.recent),
+            }
+            self.dirty = False
+        try:
+            write_json_atomic(self.path, payload)
+        except Exception as e:
+            logging.error("Failed to save launch history: %s", e)
+
+    def add(self, record, wallpaper=None, settings=None):
+        """Record one launch; record is a swap record from the process manager."""
+        entry = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "screen": record["screen"],
+            "wallpaper": wallpaper,
+            "handoff": record["handoff"],
+            "timed_out": record["timed_out"],
+            "settings": settings or {},
+        }
+        with self._lock:
+            for phase in PHASES:
+                ms = record.get(f"{phase}_ms")
+                entry[f"{phase}_ms"] = None if ms is None else round(ms, 1)
+                if ms is not None:
+                    self.histograms[phase].add(ms)
+            self.recent.append(entry)
+            self.dirty = True
+        return entry
+
+    def percentiles(self, phase="total", qs=(50, 95)):
+        with self._lock:
+            hist = self.histograms[phase]
+            return hist.total, [hist.percentile(q) for q in qs]
+
+    def export_csv(self, path):
+        """Write the recent launches to path as CSV; returns how many."""
+        with self._lock:
+            rows = list(self.recent)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, EXPORT_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({**row, "settings": json.dumps(row["settings"], sort_keys=True)})
+        return len(rows)
@@ -0,0 +1,287 @@
+import os
+import json
+import pathlib
+import time
+import queue
+import logging
+import threading
+
+from file_utils import CACHE_DIR, write_json_atomic
+
+INDEX_FILE = CACHE_DIR / "library_index.json"
+
+# Bump whenever the set of parsed fields changes so stale indexes are rebuilt.
+INDEX_VERSION = 3
+
+SCAN_BATCH_SIZE = 200
+SCAN_BATCH_INTERVAL = 0.1
+DEFAULT_ROOT_BUDGET = 10.0
+
+ROOT_OK = "ok"
+ROOT_PARTIAL = "partial"
+ROOT_SLOW = "slow"
+ROOT_ERROR = "error"
+
+
+def stat_signature(path):
+    """Return the (mtime_ns, size, inode) triple used to detect changed files."""
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def parse_project(data, item_id, path):
+    file_size = 0
+    main_file = data.get("file")
+    if isinstance(main_file, str) and main_file:
+        try:
+            file_size = os.stat(os.path.join(path, main_file)).st_size
+        except OSError:
+            pass
+    return {
+        "title": data.get("title", "Untitled"),
+        "id": item_id,
+        "path": path,
+        "preview": data.get("preview"),
+        "tags": [str(t) for t in data.get("tags") or [] if t],
+        "description": str(data.get("description") or ""),
+        "type": str(data.get("type") or ""),
+        "contentrating": str(data.get("contentrating") or ""),
+        "workshopid": str(data.get("workshopid") or ""),
+        "file_size": file_size,
+    }
+
+
+class LibraryIndex:
+    """On-disk cache of parsed project.json files keyed by item directory.
+
+    Each entry stores the stat signature of the project.json it was built
+    from, so a rescan only has to stat every item and re-parse the ones whose
+    signature changed.
+    """
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = pathlib.Path(path)
+        self.entries = {}
+        self.roots = []
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.error("Failed to read library index: %s", e)
+            return False
+        if data.get("version") != INDEX_VERSION:
+            logging.info("Library index version changed, rebuilding")
+            return False
+        with self._lock:
+            self.entries = data.get("entries", {})
+            self.roots = data.get("roots", [])
+            self.dirty = False
+        return True
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            payload = {
+                "version": INDEX_VERSION,
+                "roots": list(self.roots),
+                "entries": dict(self.entries),
+            }
+            self.dirty = False
+        try:
+            write_json_atomic(self.path, payload)
+        except Exception as e:
+            logging.error("Failed to save library index: %s", e)
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def read_item(self, item_dir, item_id):
+        """Return the wallpaper dict for item_dir, re-parsing only if changed.
+
+        Returns None when the directory has no readable project.json.
+        """
+        proj = os.path.join(item_dir, "project.json")
+        try:
+            signature = stat_signature(proj)
+        except OSError:
+            self.remove(item_dir)
+            return None
+
+        with self._lock:
+            entry = self.entries.get(item_dir)
+            if entry is not None and entry.get("sig") == signature and entry["fields"]["id"] == item_id:
+                self.hits += 1
+                return dict(entry["fields"])
+            self.misses += 1
+
+        try:
+            with open(proj, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            self.remove(item_dir)
+            return None
+        if not isinstance(data, dict):
+            self.remove(item_dir)
+            return None
+        fields = parse_project(data, item_id, item_dir)
+        with self._lock:
+            self.entries[item_dir] = {"sig": signature, "fields": fields}
+            self.dirty = True
+        return dict(fields)
+
+    def remove(self, item_dir):
+        with self._lock:
+            if self.entries.pop(item_dir, None) is not None:
+                self.dirty = True
+
+    def prune(self, keep_paths, keep_roots=()):
+        """Drop every entry whose directory is not in keep_paths.
+
+        Entries below any of keep_roots are kept regardless, which is how
+        roots that could not be scanned completely keep their items.
+        """
+        with self._lock:
+            stale = [p for p in self.entries
+                     if p not in keep_paths and not path_in_roots(p, keep_roots)]
+            for p in stale:
+                del self.entries[p]
+            if stale:
+                self.dirty = True
+        return len(stale)
+
+    def set_roots(self, roots):
+        roots = sorted(roots)
+        with self._lock:
+            if roots != self.roots:
+                self.roots = roots
+                self.dirty = True
+
+    def wallpapers(self):
+        with self._lock:
+            return [dict(e["fields"]) for e in self.entries.values()]
+
+
+def path_in_roots(path, roots):
+    return any(path == r or path.startswith(os.path.join(r, "")) for r in roots)
+
+
+def _scan_root(index, root, deadline, cancel, out):
+    """Scan one library root, putting (root, wallpaper) pairs on out.
+
+    Runs on its own thread; finishes with (root, status) once done.
+    """
+    status = ROOT_OK
+    try:
+        item = index.read_item(root, os.path.basename(root))
+        if item:
+            out.put((root, item))
+        with os.scandir(root) as it:
+            for entry in it:
+                if cancel.is_set():
+                    return
+                if time.monotonic() > deadline:
+                    status = ROOT_PARTIAL
+                    # Only listing what is left, nothing is read
+                    skipped = 1 + sum(1 for _ in it)
+                    logging.warning("Scan of %s ran out of time, %d entries skipped", root, skipped)
+                    break
+                try:
+                    if not entry.is_dir():
+                        continue
+                except OSError:
+                    continue
+                item = index.read_item(entry.path, entry.name)
+                if item:
+                    out.put((root, item))
+    except Exception as e:
+        logging.error("Failed to scan %s: %s", root, e)
+        status = ROOT_ERROR
+    out.put((root, status))
+
+
+def scan_roots(index, roots, budget=DEFAULT_ROOT_BUDGET, on_batch=None):
+    """Scan all library roots concurrently through index.
+
+    Every root runs on its own thread and gets budget seconds. Parsed items
+    are deduplicated by id and handed to on_batch in batches while the scan
+    is still running. A root that runs out of time is reported as partial;
+    one that is still blocked (e.g. on a hung network mount) when the budget
+    expires is abandoned and reported as slow. Items the index already
+    holds under a root that did not finish are returned as they were
+    cached, so an incomplete scan never drops them.
+
+    Returns (wallpapers, statuses, seen_paths).
+    """
+    out = queue.Queue()
+    cancel = threading.Event()
+    deadline = time.monotonic() + budget
+    pending = set(roots)
+    for root in roots:
+        threading.Thread(target=_scan_root, args=(index, root, deadline, cancel, out),
+                         name="library-scan", daemon=True).start()
+
+    wallpapers = []
+    statuses = {}
+    seen = set()
+    seen_paths = set()
+    batch = []
+    last_flush = time.monotonic()
+
+    def flush():
+        nonlocal batch, last_flush
+        if batch and on_batch is not None:
+            on_batch(batch)
+        batch = []
+        last_flush = time.monotonic()
+
+    while pending:
+        # A little slack past the deadline lets roots report partial results
+        timeout = deadline + 0.5 - time.monotonic()
+        if timeout <= 0:
+            break
+        try:
+            root, payload = out.get(timeout=min(timeout, SCAN_BATCH_INTERVAL))
+        except queue.Empty:
+            flush()
+            continue
+        if isinstance(payload, str):
+            statuses[root] = payload
+            pending.discard(root)
+            continue
+        if payload["id"] in seen:
+            continue
+        seen.add(payload["id"])
+        seen_paths.add(payload["path"])
+        wallpapers.append(payload)
+        batch.append(payload)
+        if len(batch) >= SCAN_BATCH_SIZE or time.monotonic() - last_flush >= SCAN_BATCH_INTERVAL:
+            flush()
+
+    cancel.set()
+    for root in pending:
+        statuses[root] = ROOT_SLOW
+        logging.warning("Scan of %s abandoned after %.0f s, keeping its cached items", root, budget)
+    incomplete = [root for root, status in statuses.items() if status != ROOT_OK]
+    kept = 0
+    for w in index.wallpapers():
+        if w["id"] in seen or not path_in_roots(w["path"], incomplete):
+            continue
+        seen.add(w["id"])
+        seen_paths.add(w["path"])
+        wallpapers.append(w)
+        batch.append(w)
+        kept += 1
+    if kept:
+        logging.info("Kept %d cached items of incompletely scanned folders", kept)
+    flush()
+    return wallpapers, statuses, seen_paths
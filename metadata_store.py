@@ -0,0 +1,179 @@
+import re
+from array import array
+
+FACETS = ("type", "tag", "rating")
+
+
+class Bitmap:
+    """Growable row bitmap, mutable in place and convertible to an int."""
+
+    def __init__(self):
+        self.bits = bytearray()
+        self._int = 0
+        self._dirty = False
+
+    def set(self, row):
+        byte = row >> 3
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte - len(self.bits) + 64))
+        self.bits[byte] |= 1 << (row & 7)
+        self._dirty = True
+
+    def clear(self, row):
+        byte = row >> 3
+        if byte < len(self.bits):
+            self.bits[byte] &= ~(1 << (row & 7)) & 0xFF
+            self._dirty = True
+
+    def value(self):
+        if self._dirty:
+            self._int = int.from_bytes(self.bits, "little")
+            self._dirty = False
+        return self._int
+
+
+class CategoryColumn:
+    """Integer-coded category values with one row bitmap per value."""
+
+    def __init__(self):
+        self.labels = []
+        self.codes = {}
+        self.bitmaps = []
+
+    def code(self, value):
+        key = value.casefold()
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.labels)
+            self.labels.append(value)
+            self.bitmaps.append(Bitmap())
+        return code
+
+    def mask(self, codes):
+        mask = 0
+        for code in codes:
+            mask |= self.bitmaps[code].value()
+        return mask
+
+
+class MetadataStore:
+    """Columnar store of the facetable wallpaper metadata.
+
+    Each wallpaper occupies one row. Type and content rating are stored as
+    small integer codes, tags as a per-row bitmask over tag codes, and file
+    size and workshop id as packed integers. Every category value also has
+    a bitmap over rows, so combining facets and counting matches are a few
+    big-int operations rather than a pass over the items.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.rows = {}
+        self.free_rows = []
+        self.alive = Bitmap()
+        self.type_codes = array("h")
+        self.rating_codes = array("h")
+        self.tag_masks = []
+        self.file_sizes = array("q")
+        self.workshop_ids = array("q")
+        self.columns = {facet: CategoryColumn() for facet in FACETS}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def clear(self):
+        self.__init__()
+
+    def add(self, w):
+        doc_id = w["id"]
+        if doc_id in self.rows:
+            self.remove(doc_id)
+        if self.free_rows:
+            row = self.free_rows.pop()
+            self.ids[row] = doc_id
+        else:
+            row = len(self.ids)
+            self.ids.append(doc_id)
+            self.type_codes.append(-1)
+            self.rating_codes.append(-1)
+            self.tag_masks.append(0)
+            self.file_sizes.append(0)
+            self.workshop_ids.append(0)
+        self.rows[doc_id] = row
+        self.alive.set(row)
+
+        types, tags, ratings = (self.columns[f] for f in FACETS)
+        code = types.code(w.get("type") or "")
+        types.bitmaps[code].set(row)
+        self.type_codes[row] = code
+        code = ratings.code(w.get("contentrating") or "")
+        ratings.bitmaps[code].set(row)
+        self.rating_codes[row] = code
+        tag_mask = 0
+        for tag in w.get("tags") or ():
+            code = tags.code(tag)
+            tags.bitmaps[code].set(row)
+            tag_mask |= 1 << code
+        self.tag_masks[row] = tag_mask
+        self.file_sizes[row] = int(w.get("file_size") or 0)
+        workshop_id = str(w.get("workshopid") or "")
+        self.workshop_ids[row] = int(workshop_id) if workshop_id.isdigit() else 0
+
+    def remove(self, doc_id):
+        row = self.rows.pop(doc_id, None)
+        if row is None:
+            return
+        self.alive.clear(row)
+        types, tags, ratings = (self.columns[f] for f in FACETS)
+        types.bitmaps[self.type_codes[row]].clear(row)
+        ratings.bitmaps[self.rating_codes[row]].clear(row)
+        tag_mask = self.tag_masks[row]
+        code = 0
+        while tag_mask:
+            if tag_mask & 1:
+                tags.bitmaps[code].clear(row)
+            tag_mask >>= 1
+            code += 1
+        self.ids[row] = None
+        self.tag_masks[row] = 0
+        self.free_rows.append(row)
+
+    def mask_of(self, doc_ids):
+        bits = Bitmap()
+        rows = self.rows
+        for doc_id in doc_ids:
+            row = rows.get(doc_id)
+            if row is not None:
+                bits.set(row)
+        return bits.value()
+
+    def ids_in(self, mask):
+        ids = self.ids
+        return [ids[m.start()] for m in re.finditer("1", bin(mask)[:1:-1])]
+
+    def filter_mask(self, selection, base=None, skip=None):
+        """AND together the selected facets (OR within one facet).
+
+        selection maps a facet name to a set of category codes; empty or
+        missing facets do not restrict. base limits the result further,
+        e.g. to the rows of a search result.
+        """
+        mask = self.alive.value() if base is None else base
+        for facet, codes in selection.items():
+            if codes and facet != skip:
+                mask &= self.columns[facet].mask(codes)
+        return mask
+
+    def counts(self, selection, base=None):
+        """Return {facet: (total, [count per code])} for the current selection.
+
+        The counts of a facet ignore that facet's own selection, so they
+        show what choosing another value of it would yield.
+        """
+        result = {}
+        for facet in FACETS:
+            mask = self.filter_mask(selection, base, skip=facet)
+            result[facet] = (mask.bit_count(),
+                             [(mask & bm.value()).bit_count()
+                              for bm in self.columns[facet].bitmaps])
+        return result
@@ -16,9 +16,9 @@ pkgs.stdenv.mkDerivation rec {
         pyqt6
         pillow
         packaging
-        watchdog
       ]))
     linux-wallpaperengine
+    util-linux
     libxcb-cursor
   ];
 
@@ -27,6 +27,18 @@ pkgs.stdenv.mkDerivation rec {
     cp -r ./locales $out/bin
     install -Dm755 ./wallpaper_gui.py $out/bin/simple-wallpaper-engine
     install -Dm644 ./process_manager.py $out/bin/process_manager.py
+    install -Dm644 ./file_utils.py $out/bin/file_utils.py
+    install -Dm644 ./inotify_watch.py $out/bin/inotify_watch.py
+    install -Dm644 ./library_index.py $out/bin/library_index.py
+    install -Dm644 ./thumbnail_cache.py $out/bin/thumbnail_cache.py
+    install -Dm644 ./search_index.py $out/bin/search_index.py
+    install -Dm644 ./metadata_store.py $out/bin/metadata_store.py
+    install -Dm644 ./project_properties.py $out/bin/project_properties.py
+    install -Dm644 ./proc_stats.py $out/bin/proc_stats.py
+    install -Dm644 ./fps_governor.py $out/bin/fps_governor.py
+    install -Dm644 ./launch_limits.py $out/bin/launch_limits.py
+    install -Dm644 ./launch_metrics.py $out/bin/launch_metrics.py
+    install -Dm644 ./pid_registry.py $out/bin/pid_registry.py
     wrapProgram $out/bin/simple-wallpaper-engine \
       --prefix PATH : ${lib.makeBinPath propagatedBuildInputs}
     mkdir -p $out/share/applications
@@ -4,7 +4,6 @@
       pyqt6
       pillow
       packaging
-      watchdog
     ]);
 in
   pkgs.mkShell {
@@ -0,0 +1,119 @@
+import os
+import json
+import logging
+
+from file_utils import PROC_ROOT, RUNTIME_DIR, read_file, write_json_atomic
+from proc_stats import process_start_time
+
+REGISTRY_FILE = RUNTIME_DIR / "backends.json"
+
+# The kernel truncates a process name (comm) to this many characters
+COMM_LENGTH = 15
+
+
+def backend_names(name):
+    """Executable names a backend can run under, including Nix's wrapper."""
+    return {name, f".{name}-wrapped"}
+
+
+def is_backend(pid, names, proc_root=PROC_ROOT):
+    """Check that pid runs one of names as its executable.
+
+    The executable (/proc/<pid>/exe) or argv[0] has to match; a name that
+    merely appears somewhere in the arguments, as with an editor or a
+    shell, does not count.
+    """
+    try:
+        exe = os.readlink(f"{proc_root}/{pid}/exe")
+        if os.path.basename(exe.removesuffix(" (deleted)")) in names:
+            return True
+    except OSError:
+        pass
+    try:
+        argv0 = read_file(f"{proc_root}/{pid}/cmdline", binary=True).split(b"\0", 1)[0]
+    except OSError:
+        return False
+    return os.path.basename(argv0.decode("utf-8", "replace")) in names
+
+
+def find_backends(name, proc_root=PROC_ROOT):
+    """Return the pids of this user's processes running the backend name."""
+    names = backend_names(name)
+    comms = {n[:COMM_LENGTH] for n in names}
+    uid = os.getuid()
+    pids = []
+    try:
+        entries = list(os.scandir(proc_root))
+    except OSError as e:
+        logging.error("Failed to list processes: %s", e)
+        return pids
+    for entry in entries:
+        if not entry.name.isdigit():
+            continue
+        try:
+            if entry.stat().st_uid != uid:
+                continue
+            # Cheap prefilter before the exe and cmdline checks
+            comm = read_file(f"{proc_root}/{entry.name}/comm", binary=True).decode("utf-8", "replace").strip()
+        except OSError:
+            continue
+        if comm in comms and is_backend(entry.name, names, proc_root):
+            pids.append(int(entry.name))
+    return pids
+
+
+class PidRegistry:
+    """Runtime file recording the backends this GUI started.
+
+    Entries pair each pid with its start time, so a pid that was reused
+    by an unrelated process is never mistaken for a backend. Entries left
+    behind by an earlier session are kept in orphans until cleaned up.
+    """
+
+    def __init__(self, path=REGISTRY_FILE, proc_root=PROC_ROOT):
+        self.path = path
+        self.proc_root = proc_root
+        self.entries = {}
+        self.orphans = {}
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.error("Failed to read backend registry: %s", e)
+            return
+        self.orphans = {int(pid): entry for pid, entry in data.get("backends", {}).items()}
+
+    def save(self):
+        try:
+            write_json_atomic(self.path, {"backends": {**self.orphans, **self.entries}})
+        except Exception as e:
+            logging.error("Failed to save backend registry: %s", e)
+
+    def sync(self, pids):
+        """Record exactly pids as the running backends of this session."""
+        pids = set(pids)
+        changed = False
+        for pid in set(self.entries) - pids:
+            del self.entries[pid]
+            changed = True
+        for pid in pids - set(self.entries):
+            start = process_start_time(pid, self.proc_root)
+            if start is not None:
+                self.entries[pid] = {"start": start}
+                changed = True
+        if changed:
+            self.save()
+
+    def live_orphans(self):
+        """Return orphaned pids that still belong to the process recorded."""
+        return [pid for pid, entry in self.orphans.items()
+                if process_start_time(pid, self.proc_root) == entry.get("start")]
+
+    def forget_orphans(self):
+        if self.orphans:
+            self.orphans = {}
+            self.save()
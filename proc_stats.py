@@ -0,0 +1,103 @@
+import os
+import time
+from collections import deque
+
+from file_utils import PROC_ROOT, read_file
+
+# How often the backends are sampled and how many samples are kept per process
+SAMPLE_INTERVAL = 2.0
+SAMPLE_HISTORY = 150
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def process_cpu_time(pid, proc_root=PROC_ROOT):
+    """Return user + system CPU seconds used by pid, or None if unknown."""
+    try:
+        fields = read_file(f"{proc_root}/{pid}/stat").rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def process_start_time(pid, proc_root=PROC_ROOT):
+    """Return when pid started, in clock ticks since boot, or None if unknown.
+
+    Together with the pid this identifies a process even after pid reuse.
+    """
+    try:
+        return int(read_file(f"{proc_root}/{pid}/stat").rsplit(")", 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def read_process_sample(pid, proc_root=PROC_ROOT):
+    """Read one resource sample for pid from /proc/<pid>/{stat,status,io}.
+
+    Returns None once the process is gone. I/O counters are None when
+    /proc/<pid>/io is not readable.
+    """
+    cpu = process_cpu_time(pid, proc_root)
+    if cpu is None:
+        return None
+    sample = {"time": time.monotonic(), "cpu": cpu, "rss": 0, "threads": 0,
+              "read_bytes": None, "write_bytes": None}
+    try:
+        for line in read_file(f"{proc_root}/{pid}/status").splitlines():
+            key, _, value = line.partition(":")
+            if key == "VmRSS":
+                sample["rss"] = int(value.split()[0]) * 1024
+            elif key == "Threads":
+                sample["threads"] = int(value)
+    except (OSError, ValueError, IndexError):
+        return None
+    try:
+        for line in read_file(f"{proc_root}/{pid}/io").splitlines():
+            key, _, value = line.partition(":")
+            if key in ("read_bytes", "write_bytes"):
+                sample[key] = int(value)
+    except (OSError, ValueError):
+        pass
+    return sample
+
+
+class ProcessStats:
+    """Ring buffer of resource samples for one process."""
+
+    def __init__(self, capacity=SAMPLE_HISTORY):
+        self.pid = None
+        self.samples = deque(maxlen=capacity)
+
+    def sample(self, pid, proc_root=PROC_ROOT):
+        if pid != self.pid:
+            self.pid = pid
+            self.samples.clear()
+        if pid is None:
+            return None
+        sample = read_process_sample(pid, proc_root)
+        if sample is not None:
+            self.samples.append(sample)
+        return sample
+
+    def summary(self):
+        """Return the latest numbers with rates over the last interval, or None."""
+        if not self.samples:
+            return None
+        last = self.samples[-1]
+        result = {
+            "pid": self.pid,
+            "cpu_percent": None,
+            "rss": last["rss"],
+            "threads": last["threads"],
+            "read_rate": None,
+            "write_rate": None,
+        }
+        if len(self.samples) >= 2:
+            prev = self.samples[-2]
+            elapsed = last["time"] - prev["time"]
+            if elapsed > 0:
+                result["cpu_percent"] = max(0.0, (last["cpu"] - prev["cpu"]) / elapsed * 100)
+                for key, rate in (("read_bytes", "read_rate"), ("write_bytes", "write_rate")):
+                    if last[key] is not None and prev[key] is not None:
+                        result[rate] = max(0, last[key] - prev[key]) / elapsed
+        return result
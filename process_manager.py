@@ -1,62 +1,585 @@
 import os
+import re
+import asyncio
 import pathlib
 import shlex
+import signal
 import subprocess
 import time
 import logging
+from collections import deque
+
+from proc_stats import ProcessStats, process_cpu_time
+from launch_limits import build_limit_prefix
+from pid_registry import PidRegistry, find_backends
 
 LOG_DIR = pathlib.Path(
     os.getenv("XDG_STATE_HOME", os.path.expanduser("~/.local/state"))
 ) / "linux-wallpaperengine-gui" / "logs"
 LOG_FILE = LOG_DIR / "wallpaperengine.log"
 
-class WallpaperProcessManager:
-    def __init__(self):
-        self._proc = None
-        self._log_path = None
-        self._log_handle = None
-        self._expected_stop = False
-
-    def start(self, cmd):
-        self._expected_stop = False
-        self._proc, self._log_path, self._log_handle = start_wallpaper_process(cmd)
-        return self._proc
-
-    def stop(self, timeout=1):
-        self._expected_stop = True
-        stopped = stop_process(self._proc, self._log_handle, timeout=timeout)
-        self._proc = None
-        self._log_handle = None
-        self._log_path = None
+# Delay between launches when several screens are started at once, so the
+# backends do not all load their assets from disk at the same time.
+COLD_START_STAGGER = 0.75
+
+# A freshly started backend counts as showing its wallpaper once it has used
+# this much CPU time (assets loaded and frames rendered), or, where /proc is
+# not available, once it has written output and stayed up READY_MIN_DELAY.
+# After HANDOFF_TIMEOUT it is assumed ready regardless.
+READY_CPU_SECONDS = 0.25
+READY_MIN_DELAY = 1.0
+HANDOFF_TIMEOUT = 5.0
+
+# Backends that die on their own are restarted after CRASH_BACKOFF_BASE
+# seconds, doubling up to CRASH_BACKOFF_MAX for every further crash. A run of
+# STABLE_RUN seconds resets the backoff; CRASH_LOOP_LIMIT crashes within
+# CRASH_LOOP_WINDOW seconds stop the restarts until the user relaunches.
+CRASH_BACKOFF_BASE = 1.0
+CRASH_BACKOFF_MAX = 60.0
+STABLE_RUN = 30.0
+CRASH_LOOP_LIMIT = 5
+CRASH_LOOP_WINDOW = 120.0
+
+# How often to check for an exit where pidfds are not available
+EXIT_POLL_INTERVAL = 0.02
+
+
+def exit_signal(returncode):
+    """Return the signal name a process was killed by, or None."""
+    if returncode is None or returncode >= 0:
+        return None
+    try:
+        return signal.Signals(-returncode).name
+    except ValueError:
+        return f"signal {-returncode}"
+
+
+def describe_exit(returncode):
+    name = exit_signal(returncode)
+    return f"killed by {name}" if name else f"exit code {returncode}"
+
+
+def screen_log_path(screen):
+    if not screen:
+        return LOG_FILE
+    safe = re.sub(r"[^\w.-]", "_", screen)
+    return LOG_DIR / f"wallpaperengine-{safe}.log"
+
+
+class BackendProcess:
+    """A backend process for one screen, with its own log and exit status.
+
+    With a handoff launch the previous process keeps running in retiring
+    until the new one is ready, so the screen never shows a bare desktop.
+    If the new process dies before that, the old one is kept instead.
+    """
+
+    def __init__(self, screen, submit=None):
+        self.screen = screen
+        # Runs background coroutines, such as stopping retiring processes
+        self.submit = submit
+        self.cmd = None
+        self.proc = None
+        self.log_path = screen_log_path(screen)
+        self.log_handle = None
+        self.starts = 0
+        self.restarts = 0
+        self.started_at = None
+        self.last_exit = None
+        # (proc, log handle, cmd, started_at, ready_at) of replaced processes
+        self.retiring = []
+        # (proc, log handle, kill deadline) of processes asked to exit
+        self.terminating = []
+        self.ready_at = None
+        self.stopped_at = None
+        self.log_offset = 0
+        self.paused = False
+        self.stats = ProcessStats()
+        self.launch = None
+        self.launch_began = None
+        self.crash_times = deque()
+        self.backoff_level = 0
+        self.crash_loop = False
+        self.last_crash = None
+
+    @property
+    def pid(self):
+        return self.proc.pid if self.proc is not None else None
+
+    def pids(self):
+        pids = {proc.pid for proc, *_ in self.retiring}
+        pids.update(proc.pid for proc, _, _ in self.terminating)
+        if self.proc is not None:
+            pids.add(self.proc.pid)
+        return pids
+
+    async def start(self, cmd, handoff=False, prefix=(), requested_at=None):
+        began = time.monotonic()
+        # A stopped (SIGSTOP) process cannot act on SIGTERM, wake it first
+        self.resume()
+        self.stopped_at = None
+        if self.proc is not None:
+            if handoff and self.ready_at is not None:
+                self.retiring.append((self.proc, self.log_handle, self.cmd, self.started_at, self.ready_at))
+                self.proc = None
+                self.log_handle = None
+            else:
+                # Never shown yet (or no handoff wanted): replace it outright
+                await self._stop_current()
+                if not self.retiring:
+                    self.stopped_at = time.monotonic()
+        self.crash_loop = False
+        if list(cmd) != self.cmd:
+            # A different wallpaper or setting gets a clean crash history
+            self.crash_times.clear()
+            self.backoff_level = 0
+            self.last_crash = None
+        spawning = time.monotonic()
+        self.proc, self.log_path, self.log_handle = start_wallpaper_process(cmd, self.log_path, prefix)
+        self.log_offset = self.log_handle.tell()
+        self.cmd = list(cmd)
+        self.starts += 1
+        self.started_at = time.monotonic()
+        # Phase timings, completed by poll_ready() once the backend is up
+        self.launch_began = began if requested_at is None else requested_at
+        self.launch = {
+            "build_ms": None if requested_at is None else (began - requested_at) * 1000,
+            "stop_ms": (spawning - began) * 1000,
+            "spawn_ms": (self.started_at - spawning) * 1000,
+            "first_output_ms": None,
+        }
+        self.ready_at = None
+        self.last_exit = None
+        return self.proc
+
+    async def _stop(self, proc, handle, timeout=1):
+        entry = (proc, handle, time.monotonic() + timeout)
+        self.terminating.append(entry)
+        # If cancelled, the process was killed and stays here for check() to reap
+        stopped = await stop_process_async(proc, handle, timeout=timeout)
+        if entry in self.terminating:
+            self.terminating.remove(entry)
         return stopped
 
-    def is_running(self):
-        return self._proc is not None
+    async def _stop_current(self, timeout=1):
+        # Detach first, so the screen is free while the old process exits
+        proc, handle = self.proc, self.log_handle
+        self.proc = None
+        self.log_handle = None
+        if proc is None:
+            close_log_handle(handle)
+            return False
+        stopped = await self._stop(proc, handle, timeout)
+        self.last_exit = {"returncode": proc.returncode, "expected": True, "time": time.time()}
+        return stopped
+
+    def _terminate_retiring(self, timeout=1):
+        """Stop the retiring processes in the background.
+
+        Without submit they are only sent SIGTERM here, and check() reaps
+        them and SIGKILLs any that outstay timeout.
+        """
+        retiring, self.retiring = self.retiring, []
+        for proc, handle, *_ in retiring:
+            if self.submit is not None:
+                self.submit(self._stop(proc, handle, timeout))
+                continue
+            try:
+                proc.terminate()
+            except OSError:
+                pass
+            self.terminating.append((proc, handle, time.monotonic() + timeout))
+
+    async def _reap(self, entry, timeout=1):
+        """Wait for a process already asked to exit, SIGKILLing it at its deadline."""
+        proc, handle, kill_at = entry
+        try:
+            await wait_for_exit(proc, max(kill_at - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            try:
+                proc.kill()
+                await wait_for_exit(proc, timeout)
+            except (OSError, asyncio.TimeoutError):
+                return False
+        if entry in self.terminating:
+            self.terminating.remove(entry)
+            close_log_handle(handle)
+        return True
+
+    async def stop(self, timeout=1):
+        self.resume()
+        retiring, self.retiring = self.retiring, []
+        # Includes processes whose stop was cancelled, e.g. on quit
+        terminating = list(self.terminating)
+        current, *others = await asyncio.gather(
+            self._stop_current(timeout),
+            *(self._stop(proc, handle, timeout) for proc, handle, *_ in retiring),
+            *(self._reap(entry, timeout) for entry in terminating))
+        return current and all(others)
+
+    def _signal_all(self, sig):
+        for pid in self.pids():
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def pause(self):
+        """Freeze the backend with SIGSTOP; it keeps its state but uses no CPU."""
+        if self.paused or not self.pids():
+            return False
+        self._signal_all(signal.SIGSTOP)
+        self.paused = True
+        return True
+
+    def resume(self):
+        if not self.paused:
+            return False
+        self._signal_all(signal.SIGCONT)
+        self.paused = False
+        return True
 
-    def log_path(self):
-        return self._log_path or LOG_FILE
+    def _output_seen(self):
+        try:
+            return os.path.getsize(self.log_path) > self.log_offset
+        except OSError:
+            return False
+
+    def poll_ready(self):
+        """Check whether the current process is up yet.
+
+        Returns a swap record the first time it is: how long it took to get
+        ready and, when it replaced an earlier process, the gap during which
+        neither was on screen. The record also carries the launch phase
+        timings (build, stop, spawn, first output, ready and total, in ms).
+        The retiring processes are stopped then.
+        """
+        if self.proc is None or self.ready_at is not None:
+            return None
+        now = time.monotonic()
+        elapsed = now - self.started_at
+        output_seen = self._output_seen()
+        if output_seen and self.launch["first_output_ms"] is None:
+            self.launch["first_output_ms"] = elapsed * 1000
+        cpu = process_cpu_time(self.proc.pid)
+        if cpu is not None:
+            ready = cpu >= READY_CPU_SECONDS
+        else:
+            ready = elapsed >= READY_MIN_DELAY and output_seen
+        if not ready and elapsed < HANDOFF_TIMEOUT:
+            return None
+        self.ready_at = now
+        handoff = bool(self.retiring)
+        self._terminate_retiring()
+        gap = None
+        if handoff:
+            gap = 0.0
+        elif self.stopped_at is not None:
+            gap = now - self.stopped_at
+        return {
+            **self.launch,
+            "screen": self.screen,
+            "cmd": self.cmd,
+            "ready_ms": elapsed * 1000,
+            "total_ms": (now - self.launch_began) * 1000,
+            "gap_ms": None if gap is None else gap * 1000,
+            "handoff": handoff,
+            "timed_out": not ready,
+        }
 
     def check(self):
-        if self._proc is None:
+        alive = []
+        for entry in self.retiring:
+            if entry[0].poll() is None:
+                alive.append(entry)
+            else:
+                close_log_handle(entry[1])
+        self.retiring = alive
+        now = time.monotonic()
+        terminating = []
+        for proc, handle, kill_at in self.terminating:
+            if proc.poll() is not None:
+                close_log_handle(handle)
+                continue
+            if now >= kill_at:
+                try:
+                    proc.kill()
+                except OSError:
+                    pass
+            terminating.append((proc, handle, kill_at))
+        self.terminating = terminating
+        if self.proc is None:
             return None
-        returncode = self._proc.poll()
+        returncode = self.proc.poll()
         if returncode is None:
             return None
-        close_log_handle(self._log_handle)
-        log_path = self._log_path
-        expected = self._expected_stop
-        self._proc = None
-        self._log_handle = None
-        self._log_path = None
-        self._expected_stop = False
-        return {
+        close_log_handle(self.log_handle)
+        result = {
+            "screen": self.screen,
             "returncode": returncode,
-            "log_path": log_path,
-            "expected": expected,
+            "log_path": self.log_path,
+            # Stopped processes are detached first, so this one ended on its own
+            "expected": False,
+            "swap_aborted": False,
+            "restart_delay": None,
+        }
+        self.last_exit = {"returncode": returncode, "expected": False, "time": time.time()}
+        self.proc = None
+        self.log_handle = None
+        if not self.retiring:
+            self.paused = False
+        if self.retiring:
+            # The replacement died before it was ready; keep the old one
+            self.proc, self.log_handle, self.cmd, self.started_at, self.ready_at = self.retiring.pop()
+            self._terminate_retiring()
+            result["swap_aborted"] = True
+        else:
+            self.last_crash = self.last_exit
+            result["restart_delay"] = self._plan_restart()
+        return result
+
+    def _plan_restart(self):
+        """Record a crash; return the backoff delay, or None in a crash loop."""
+        now = time.monotonic()
+        if self.started_at is not None and now - self.started_at >= STABLE_RUN:
+            self.backoff_level = 0
+        self.crash_times.append(now)
+        while self.crash_times and now - self.crash_times[0] > CRASH_LOOP_WINDOW:
+            self.crash_times.popleft()
+        if len(self.crash_times) >= CRASH_LOOP_LIMIT:
+            self.crash_loop = True
+            return None
+        delay = min(CRASH_BACKOFF_BASE * 2 ** self.backoff_level, CRASH_BACKOFF_MAX)
+        self.backoff_level += 1
+        return delay
+
+    def status(self):
+        return {
+            "resources": self.stats.summary() if self.proc is not None else None,
+            "screen": self.screen,
+            "running": self.proc is not None,
+            "paused": self.paused,
+            "pid": self.pid,
+            "restarts": self.restarts,
+            "last_exit": self.last_exit,
+            "last_crash": self.last_crash,
+            "crashes": len(self.crash_times),
+            "crash_loop": self.crash_loop,
+            "log_path": self.log_path,
         }
 
+
+class AsyncWallpaperProcessManager:
+    """Pool of backend processes keyed by screen, driven by asyncio.
+
+    Starting, stopping or restarting one screen never touches the
+    processes of the others. start(), stop() and restart() are coroutines
+    that wait for old backends to exit without blocking the event loop;
+    stopping several screens waits for all of them at once. A new start()
+    or stop() on a screen cancels one still in progress there.
+    """
+
+    def __init__(self, on_spawn=None, registry=None, submit=None):
+        self._procs = {}
+        self._ops = {}
+        self._last_screen = None
+        # Backends of this session, plus whatever an earlier one left behind
+        if registry is None:
+            registry = PidRegistry()
+            registry.load()
+        self.registry = registry
+        # Called with every new Popen, e.g. to watch it for exit
+        self.on_spawn = on_spawn
+        # Called with coroutines to run in the background on the caller's
+        # event loop, e.g. stopping the old backend once a handoff is done
+        self.submit = submit
+        self.limits = {}
+        self.limit_prefix = []
+
+    def set_limits(self, limits):
+        """Use limits (nice, ionice, cpus, cpu_quota, memory_max) for new launches.
+
+        Returns the problems of constraints that were dropped because they
+        are invalid or cannot be applied on this system.
+        """
+        self.limit_prefix, problems = build_limit_prefix(limits)
+        self.limits = dict(limits)
+        for problem in problems:
+            logging.warning("Launch limit not applied: %s", problem)
+        return problems
+
+    def _backend(self, screen):
+        backend = self._procs.get(screen)
+        if backend is None:
+            backend = self._procs[screen] = BackendProcess(screen, submit=self.submit)
+        return backend
+
+    def _supersede(self, screens):
+        task = asyncio.current_task()
+        for screen in screens:
+            previous = self._ops.get(screen)
+            if previous is not None and previous is not task and not previous.done():
+                previous.cancel()
+            self._ops[screen] = task
+
+    def _release(self, screens):
+        task = asyncio.current_task()
+        for screen in screens:
+            if self._ops.get(screen) is task:
+                del self._ops[screen]
+
+    async def start(self, cmd, screen="", handoff=False, requested_at=None):
+        """Start cmd on screen, replacing whatever runs there.
+
+        With handoff the old process is only stopped once poll_ready()
+        finds the new one ready. requested_at is the time.monotonic() at
+        which the user asked for the launch, for latency accounting.
+        """
+        self._last_screen = screen
+        self._supersede([screen])
+        try:
+            proc = await self._backend(screen).start(cmd, handoff=handoff, prefix=self.limit_prefix,
+                                                     requested_at=requested_at)
+        finally:
+            self._release([screen])
+        self.registry.sync(self.pids())
+        if self.on_spawn is not None:
+            self.on_spawn(proc)
+        return proc
+
+    async def stop(self, screen=None, timeout=1):
+        """Stop one screen, or every screen when screen is None.
+
+        Returns True if at least one process was running and all of them
+        stopped.
+        """
+        screens = list(self._procs) if screen is None else [screen]
+        self._supersede(screens)
+        try:
+            running = [self._procs[s] for s in screens if s in self._procs and self._procs[s].pids()]
+            stopped = await asyncio.gather(*(backend.stop(timeout=timeout) for backend in running))
+        finally:
+            self._release(screens)
+        self.registry.sync(self.pids())
+        return bool(stopped) and all(stopped)
+
+    async def restart(self, screen, handoff=False):
+        backend = self._procs.get(screen)
+        if backend is None or backend.cmd is None:
+            return None
+        backend.restarts += 1
+        return await self.start(backend.cmd, screen, handoff=handoff)
+
+    def _selected(self, screen):
+        if screen is None:
+            return list(self._procs.values())
+        backend = self._procs.get(screen)
+        return [backend] if backend is not None else []
+
+    def pause(self, screen=None):
+        """Suspend one screen's backend, or all of them when screen is None."""
+        return [b.screen for b in self._selected(screen) if b.pause()]
+
+    def resume(self, screen=None):
+        return [b.screen for b in self._selected(screen) if b.resume()]
+
+    def is_paused(self, screen=None):
+        backends = [b for b in self._selected(screen) if b.proc is not None]
+        return bool(backends) and all(b.paused for b in backends)
+
+    def is_running(self, screen=None):
+        if screen is None:
+            return any(b.proc is not None for b in self._procs.values())
+        backend = self._procs.get(screen)
+        return backend is not None and backend.proc is not None
+
+    def sample(self):
+        """Take one resource sample of every running backend."""
+        for backend in self._procs.values():
+            backend.stats.sample(backend.pid)
+
+    def current_command(self, screen):
+        """Return the command running on screen, or None if nothing runs there."""
+        backend = self._procs.get(screen)
+        if backend is None or backend.proc is None:
+            return None
+        return backend.cmd
+
+    def pids(self):
+        return set().union(*(b.pids() for b in self._procs.values()))
+
+    def awaiting_ready(self):
+        return any(b.proc is not None and b.ready_at is None for b in self._procs.values())
+
+    def poll_ready(self):
+        """Return swap records for processes that became ready since the last poll."""
+        records = []
+        for backend in self._procs.values():
+            record = backend.poll_ready()
+            if record is not None:
+                records.append(record)
+        if records:
+            self.registry.sync(self.pids())
+        return records
+
+    def log_path(self, screen=None):
+        if screen is None:
+            screen = self._last_screen
+        backend = self._procs.get(screen)
+        return backend.log_path if backend is not None else screen_log_path(screen)
+
+    def check(self):
+        """Return the exit results of every process that ended since the last check.
+
+        Unexpected exits carry restart_delay: seconds to wait before
+        restarting, or None once the screen is in a crash loop.
+        """
+        results = []
+        for backend in self._procs.values():
+            result = backend.check()
+            if result is not None:
+                results.append(result)
+        self.registry.sync(self.pids())
+        return results
+
+    def statuses(self):
+        return [b.status() for b in self._procs.values() if b.cmd is not None]
+
     def kill_external(self, process_name):
-        return kill_external_wallpapers(process_name, ignore_pid=os.getpid())
+        """Stop backends this session does not own, e.g. orphans of a crashed GUI."""
+        killed = kill_external_wallpapers(process_name, ignore_pids={os.getpid(), *self.pids()},
+                                          extra_pids=self.registry.live_orphans())
+        self.registry.forget_orphans()
+        return killed
+
+
+class WallpaperProcessManager:
+    """Blocking facade over AsyncWallpaperProcessManager.
+
+    start(), stop() and restart() run the coroutines to completion on a
+    private event loop; everything else is passed through to aio.
+    """
+
+    def __init__(self, on_spawn=None, registry=None, submit=None):
+        self.aio = AsyncWallpaperProcessManager(on_spawn=on_spawn, registry=registry, submit=submit)
+        self._loop = None
+
+    def __getattr__(self, name):
+        return getattr(self.aio, name)
+
+    def _run(self, coro):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def start(self, cmd, screen="", handoff=False, requested_at=None):
+        return self._run(self.aio.start(cmd, screen, handoff=handoff, requested_at=requested_at))
+
+    def stop(self, screen=None, timeout=1):
+        return self._run(self.aio.stop(screen, timeout=timeout))
+
+    def restart(self, screen, handoff=False):
+        return self._run(self.aio.restart(screen, handoff=handoff))
 
 
 def ensure_log_dir():
@@ -67,13 +590,13 @@ def ensure_log_dir():
     return LOG_DIR
 
 
-def open_wallpaper_log(cmd):
+def open_wallpaper_log(cmd, log_path=LOG_FILE):
     ensure_log_dir()
-    log_handle = open(LOG_FILE, "a", encoding="utf-8")
+    log_handle = open(log_path, "a", encoding="utf-8")
     timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
     log_handle.write(f"\n[{timestamp}] command: {shlex.join(cmd)}\n")
     log_handle.flush()
-    return LOG_FILE, log_handle
+    return log_path, log_handle
 
 
 def close_log_handle(log_handle):
@@ -86,8 +609,9 @@ def close_log_handle(log_handle):
         pass
 
 
-def start_wallpaper_process(cmd):
-    log_path, log_handle = open_wallpaper_log(cmd)
+def start_wallpaper_process(cmd, log_path=LOG_FILE, prefix=()):
+    cmd = [*prefix, *cmd]
+    log_path, log_handle = open_wallpaper_log(cmd, log_path)
     try:
         proc = subprocess.Popen(
             cmd,
@@ -101,42 +625,92 @@ def start_wallpaper_process(cmd):
         raise
 
 
-def stop_process(proc, log_handle=None, timeout=1):
+async def wait_for_exit(proc, timeout):
+    """Wait up to timeout seconds for proc to exit without blocking the loop.
+
+    Waits on a pidfd where available and polls otherwise. Returns the exit
+    status; raises asyncio.TimeoutError if proc is still running.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        fd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        fd = None
+    try:
+        if fd is not None:
+            exited = loop.create_future()
+            loop.add_reader(fd, lambda: exited.done() or exited.set_result(None))
+            try:
+                await asyncio.wait_for(exited, timeout)
+            finally:
+                loop.remove_reader(fd)
+        else:
+            deadline = loop.time() + timeout
+            while proc.poll() is None:
+                if loop.time() >= deadline:
+                    raise asyncio.TimeoutError()
+                await asyncio.sleep(EXIT_POLL_INTERVAL)
+    finally:
+        if fd is not None:
+            os.close(fd)
+    # Already exited, so this only reaps it
+    return proc.wait()
+
+
+async def stop_process_async(proc, log_handle=None, timeout=1):
+    """SIGTERM proc and wait for it, then SIGKILL it if it does not exit.
+
+    Cancelling the wait kills the process outright.
+    """
     if proc is None:
         close_log_handle(log_handle)
         return False
     stopped = False
     try:
-        proc.terminate()
-        proc.wait(timeout=timeout)
-        stopped = True
-    except Exception:
         try:
-            proc.kill()
-            proc.wait(timeout=timeout)
+            proc.terminate()
+            await wait_for_exit(proc, timeout)
             stopped = True
+        except asyncio.CancelledError:
+            raise
         except Exception:
-            stopped = False
-    close_log_handle(log_handle)
+            try:
+                proc.kill()
+                await wait_for_exit(proc, timeout)
+                stopped = True
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                stopped = False
+    except asyncio.CancelledError:
+        try:
+            proc.kill()
+        except OSError:
+            pass
+        raise
+    finally:
+        close_log_handle(log_handle)
     return stopped
 
 
-def kill_external_wallpapers(process_name, ignore_pid=None):
+def kill_external_wallpapers(process_name, ignore_pids=(), extra_pids=()):
+    """Send SIGTERM to every backend process not in ignore_pids.
+
+    Backends are found by scanning /proc for processes whose executable
+    is process_name; extra_pids (registry entries already verified by
+    their start time) are stopped as well.
+    """
     try:
-        cmd = ["pgrep", "-f", process_name]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            return 0
+        pids = set(find_backends(process_name)) | set(extra_pids)
         killed = 0
-        for pid_str in result.stdout.splitlines():
+        for pid in pids - set(ignore_pids):
             try:
-                pid = int(pid_str)
-                if ignore_pid is not None and pid == ignore_pid:
-                    continue
-                os.kill(pid, 15)
+                os.kill(pid, signal.SIGTERM)
                 killed += 1
-            except (ValueError, ProcessLookupError):
+            except ProcessLookupError:
                 continue
+        if killed:
+            logging.info("Stopped %d external backend process(es)", killed)
         return killed
     except Exception as e:
         logging.error("Failed to kill external wallpapers: %s", e)
@@ -0,0 +1,254 @@
+import os
+import json
+import time
+import logging
+import selectors
+import threading
+
+from file_utils import CACHE_DIR, write_json_atomic
+
+PROPERTIES_CACHE_FILE = CACHE_DIR / "properties.json"
+PROPERTIES_CACHE_VERSION = 1
+
+PROBE_TIMEOUT = 5.0
+# Once a listing has started, this much quiet after the last property means
+# the backend is done listing (it may keep running without exiting).
+PROBE_SETTLE = 0.5
+
+LISTING_EXITED = "exited"
+LISTING_COMPLETE = "complete"
+LISTING_TIMEOUT = "timeout"
+
+# Property types that only label or group the settings page and carry no value
+DISPLAY_ONLY_TYPES = {"text", "group"}
+
+
+def format_property_value(prop_type, value):
+    """Format a project.json value the way --set-property expects it."""
+    if prop_type == "bool" or isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def read_project_properties(item_dir):
+    """Read the user properties declared in item_dir's project.json.
+
+    Returns a list of property dicts ordered like the Wallpaper Engine
+    settings page, or None when there is no readable project.json. Each
+    dict has name, value (already formatted for --set-property), type,
+    text and, depending on the type, min/max/step or options.
+    """
+    proj = os.path.join(item_dir, "project.json")
+    try:
+        with open(proj, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.error("Failed to read %s: %s", proj, e)
+        return None
+    if not isinstance(data, dict):
+        return None
+    general = data.get("general")
+    raw = general.get("properties") if isinstance(general, dict) else None
+    if not isinstance(raw, dict):
+        return []
+
+    props = []
+    for name, spec in raw.items():
+        if not isinstance(spec, dict) or "value" not in spec:
+            continue
+        prop_type = str(spec.get("type") or "").lower()
+        if prop_type in DISPLAY_ONLY_TYPES:
+            continue
+        prop = {
+            "name": str(name),
+            "value": format_property_value(prop_type, spec["value"]),
+            "type": prop_type,
+            "text": str(spec.get("text") or ""),
+            "order": spec.get("order", 0) if isinstance(spec.get("order", 0), (int, float)) else 0,
+        }
+        if prop_type == "slider":
+            for key in ("min", "max", "step"):
+                if isinstance(spec.get(key), (int, float)):
+                    prop[key] = spec[key]
+        elif prop_type == "combo":
+            prop["options"] = [
+                {"label": str(o.get("label", o.get("value", ""))),
+                 "value": format_property_value("", o.get("value", ""))}
+                for o in spec.get("options") or () if isinstance(o, dict)
+            ]
+        props.append(prop)
+    props.sort(key=lambda p: p["order"])
+    return props
+
+
+def describe_property(prop):
+    """Short type description for the property editor, e.g. 'slider 0..10'."""
+    prop_type = prop.get("type", "")
+    if prop_type == "slider" and "min" in prop and "max" in prop:
+        return f"{prop_type} {prop['min']}..{prop['max']}"
+    if prop_type == "combo" and prop.get("options"):
+        return f"{prop_type}: " + ", ".join(o["value"] for o in prop["options"])
+    return prop_type
+
+
+def project_mtime(item_dir):
+    if not item_dir:
+        return None
+    try:
+        return os.stat(os.path.join(item_dir, "project.json")).st_mtime_ns
+    except OSError:
+        return None
+
+
+class PropertyCache:
+    """Persistent property listings keyed by wallpaper id.
+
+    Every listing remembers the project.json mtime it was read at and is
+    only served while that still matches. Listings obtained from the
+    backend for wallpapers outside the library have no project.json and
+    are stored with a mtime of None.
+    """
+
+    def __init__(self, path=PROPERTIES_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.error("Failed to read property cache: %s", e)
+            return
+        if data.get("version") == PROPERTIES_CACHE_VERSION:
+            with self._lock:
+                self.entries = data.get("entries", {})
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            payload = {"version": PROPERTIES_CACHE_VERSION, "entries": dict(self.entries)}
+            self.dirty = False
+        try:
+            write_json_atomic(self.path, payload)
+        except Exception as e:
+            logging.error("Failed to save property cache: %s", e)
+
+    def get(self, wallpaper_id, item_dir=None):
+        """Return a copy of the cached listing, or None if missing or stale."""
+        mtime = project_mtime(item_dir)
+        with self._lock:
+            entry = self.entries.get(wallpaper_id)
+            if entry is None or entry["mtime"] != mtime:
+                return None
+            return [dict(p) for p in entry["props"]]
+
+    def put(self, wallpaper_id, item_dir, props):
+        mtime = project_mtime(item_dir)
+        with self._lock:
+            self.entries[wallpaper_id] = {"mtime": mtime, "props": [dict(p) for p in props]}
+            self.dirty = True
+
+    def listing(self, wallpaper_id, item_dir):
+        """Return the listing for a library item, reading project.json on a miss."""
+        props = self.get(wallpaper_id, item_dir)
+        if props is None:
+            props = read_project_properties(item_dir)
+            if props is not None:
+                self.put(wallpaper_id, item_dir, props)
+        return props
+
+
+class ListingParser:
+    """Incremental parser for the listing printed by linux-wallpaperengine -l.
+
+    Properties are printed as a "name - type" header followed by indented
+    detail lines and a "Value: ..." line. feed() takes one line at a time
+    and returns a (name, value, sep, type) tuple whenever a property is
+    complete.
+    """
+
+    def __init__(self):
+        self.props = []
+        self.current = None
+
+    @property
+    def between_properties(self):
+        return bool(self.props) and self.current is None
+
+    def feed(self, line):
+        stripped = line.strip()
+        if not stripped:
+            return None
+        if stripped.startswith("Value:"):
+            if self.current is None:
+                return None
+            name, prop_type = self.current
+            self.current = None
+            prop = (name, stripped.split("Value:", 1)[1].strip(), "=", prop_type)
+            self.props.append(prop)
+            return prop
+        if stripped.startswith("_") or " - " in stripped:
+            name, _, prop_type = stripped.partition(" - ")
+            self.current = (name.strip(), prop_type.strip())
+        return None
+
+
+def read_listing(proc, on_property=None, timeout=PROBE_TIMEOUT, settle=PROBE_SETTLE):
+    """Read a backend property listing from proc.stdout as it arrives.
+
+    Properties are handed to on_property as soon as they are parsed. Reading
+    stops when the backend exits, when nothing new has been listed for
+    settle seconds after the last property, or after timeout seconds.
+
+    Returns (output, props, state) with state one of LISTING_EXITED,
+    LISTING_COMPLETE or LISTING_TIMEOUT.
+    """
+    parser = ListingParser()
+    fd = proc.stdout.fileno()
+    chunks = []
+    pending = b""
+    deadline = time.monotonic() + timeout
+    last_prop = None
+    state = LISTING_TIMEOUT
+
+    def feed(raw):
+        nonlocal last_prop
+        prop = parser.feed(raw.decode("utf-8", "replace"))
+        if prop is not None:
+            last_prop = time.monotonic()
+            if on_property is not None:
+                on_property(prop)
+
+    with selectors.DefaultSelector() as sel:
+        sel.register(fd, selectors.EVENT_READ)
+        while True:
+            now = time.monotonic()
+            limit = deadline
+            if parser.between_properties and last_prop + settle < deadline:
+                limit = last_prop + settle
+            if now >= limit:
+                state = LISTING_TIMEOUT if limit == deadline else LISTING_COMPLETE
+                break
+            if not sel.select(limit - now):
+                continue
+            data = os.read(fd, 65536)
+            if not data:
+                state = LISTING_EXITED
+                break
+            chunks.append(data)
+            *lines, pending = (pending + data).split(b"\n")
+            for raw in lines:
+                feed(raw)
+    if pending:
+        feed(pending)
+    return b"".join(chunks).decode("utf-8", "replace"), parser.props, state
@@ -0,0 +1,187 @@
+import re
+import difflib
+from collections import defaultdict
+
+# Relative weight of a match depending on the field it was found in
+FIELD_WEIGHTS = {
+    "title": 4.0,
+    "id": 3.0,
+    "tags": 2.0,
+    "description": 1.0,
+}
+# Relative weight of a match depending on how the query token matched
+EXACT = 1.0
+PREFIX = 0.8
+SUBSTRING = 0.6
+FUZZY = 0.4
+
+MAX_PREFIX = 6
+# Terms whose expansion fans out to more postings than this (typically one
+# or two letter prefixes) are matched as a plain set union without ranking.
+BROAD_TERM_POSTINGS = 100000
+MAX_DESCRIPTION_TOKENS = 200
+FUZZY_MIN_RATIO = 0.7
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).casefold())
+
+
+def trigrams(token, pad=True):
+    if pad:
+        token = f"  {token} "
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """Inverted index over wallpaper titles, ids, tags and descriptions.
+
+    Postings map each vocabulary token to the documents containing it and
+    the best field weight it appeared with. Prefix and trigram tables are
+    kept over the vocabulary rather than the documents, so prefix,
+    substring and typo-tolerant lookups only touch the (much smaller) set
+    of distinct tokens before fanning out to postings.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.prefixes = defaultdict(set)
+        self.grams = defaultdict(set)
+        self.doc_tokens = {}
+
+    def __len__(self):
+        return len(self.doc_tokens)
+
+    def clear(self):
+        self.postings.clear()
+        self.prefixes.clear()
+        self.grams.clear()
+        self.doc_tokens.clear()
+
+    def document_tokens(self, w):
+        # Lowest weight first, so heavier fields overwrite lighter ones
+        tokens = dict.fromkeys(
+            tokenize(w.get("description") or "")[:MAX_DESCRIPTION_TOKENS],
+            FIELD_WEIGHTS["description"])
+        tokens.update(dict.fromkeys(
+            tokenize(" ".join(w.get("tags") or ())), FIELD_WEIGHTS["tags"]))
+        tokens.update(dict.fromkeys(tokenize(w.get("id", "")), FIELD_WEIGHTS["id"]))
+        tokens.update(dict.fromkeys(tokenize(w.get("title", "")), FIELD_WEIGHTS["title"]))
+        return tokens
+
+    def add(self, w):
+        doc_id = w["id"]
+        if doc_id in self.doc_tokens:
+            self.remove(doc_id)
+        tokens = self.document_tokens(w)
+        self.doc_tokens[doc_id] = tokens
+        postings = self.postings
+        for token, weight in tokens.items():
+            posting = postings.get(token)
+            if posting is None:
+                postings[token] = {doc_id: weight}
+                self._add_vocabulary(token)
+            else:
+                posting[doc_id] = weight
+
+    def remove(self, doc_id):
+        tokens = self.doc_tokens.pop(doc_id, None)
+        if not tokens:
+            return
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self.postings[token]
+                self._remove_vocabulary(token)
+
+    def _add_vocabulary(self, token):
+        for n in range(1, min(len(token), MAX_PREFIX) + 1):
+            self.prefixes[token[:n]].add(token)
+        for gram in trigrams(token):
+            self.grams[gram].add(token)
+
+    def _remove_vocabulary(self, token):
+        for n in range(1, min(len(token), MAX_PREFIX) + 1):
+            bucket = self.prefixes.get(token[:n])
+            if bucket is not None:
+                bucket.discard(token)
+                if not bucket:
+                    del self.prefixes[token[:n]]
+        for gram in trigrams(token):
+            bucket = self.grams.get(gram)
+            if bucket is not None:
+                bucket.discard(token)
+                if not bucket:
+                    del self.grams[gram]
+
+    def _expand(self, term):
+        """Return {vocabulary token: match weight} for one query term."""
+        matches = {}
+        if term in self.postings:
+            matches[term] = EXACT
+
+        bucket = self.prefixes.get(term[:MAX_PREFIX], ())
+        for token in bucket:
+            if token != term and token.startswith(term):
+                matches[token] = PREFIX
+
+        if len(term) >= 3:
+            inner = trigrams(term, pad=False)
+            candidates = None
+            for gram in sorted(inner, key=lambda g: len(self.grams.get(g, ()))):
+                tokens = self.grams.get(gram)
+                if not tokens:
+                    candidates = set()
+                    break
+                candidates = set(tokens) if candidates is None else candidates & tokens
+                if not candidates:
+                    break
+            for token in candidates or ():
+                if token not in matches and term in token:
+                    matches[token] = SUBSTRING
+
+        if not matches and len(term) >= 3:
+            padded = trigrams(term)
+            counts = defaultdict(int)
+            for gram in padded:
+                for token in self.grams.get(gram, ()):
+                    counts[token] += 1
+            needed = max(2, int(len(padded) * 0.4))
+            for token, shared in counts.items():
+                if shared < needed:
+                    continue
+                ratio = difflib.SequenceMatcher(None, term, token).ratio()
+                if ratio >= FUZZY_MIN_RATIO:
+                    matches[token] = FUZZY * ratio
+        return matches
+
+    def search(self, query):
+        """Return {doc_id: score} for documents matching every query term."""
+        terms = tokenize(query)
+        if not terms:
+            return None
+        scores = None
+        for term in dict.fromkeys(terms):
+            expanded = self._expand(term)
+            postings = [self.postings[token] for token in expanded]
+            if sum(map(len, postings)) > BROAD_TERM_POSTINGS:
+                term_scores = dict.fromkeys(set().union(*postings), FUZZY)
+            else:
+                term_scores = {}
+                for token, match_weight in expanded.items():
+                    for doc_id, field_weight in self.postings[token].items():
+                        score = match_weight * field_weight
+                        if score > term_scores.get(doc_id, 0.0):
+                            term_scores[doc_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                return {}
+        return scores
@@ -0,0 +1,253 @@
+import os
+import json
+import mmap
+import time
+import logging
+import threading
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from file_utils import CACHE_DIR, write_json_atomic
+
+ATLAS_FILE = CACHE_DIR / "thumbnails.atlas"
+ATLAS_INDEX_FILE = CACHE_DIR / "thumbnails.json"
+
+THUMB_WIDTH = 200
+THUMB_HEIGHT = 140
+# Thumbnails are stored as packed RGB888 rows.
+THUMB_BYTES = THUMB_WIDTH * THUMB_HEIGHT * 3
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+GROW_SLOTS = 64
+
+ATLAS_VERSION = 1
+
+
+class ThumbnailCache:
+    """Persistent store of pre-cropped thumbnails in one memory-mapped file.
+
+    The atlas is an array of fixed-size slots holding raw RGB888 pixels; a
+    JSON index maps preview paths to their slot together with the preview's
+    mtime and size. A preview whose stat no longer matches is treated as a
+    miss and its slot is recycled. Once the atlas reaches max_bytes the
+    least recently used slot is reused.
+
+    Previews that are missing or cannot be decoded are remembered the same
+    way, by mtime and size, so they are not decoded again until they change.
+    """
+
+    def __init__(self, atlas_path=ATLAS_FILE, index_path=ATLAS_INDEX_FILE,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.atlas_path = atlas_path
+        self.index_path = index_path
+        self.max_slots = max(1, max_bytes // THUMB_BYTES)
+        self.entries = {}
+        # path -> [mtime, size] of a preview that failed, None if it was missing
+        self.failed = {}
+        self.free_slots = []
+        self.slot_count = 0
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._file = None
+        self._mm = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        try:
+            self.atlas_path.parent.mkdir(parents=True, exist_ok=True)
+            self._load_index()
+            self._file = open(self.atlas_path, "a+b")
+            size = os.fstat(self._file.fileno()).st_size
+            if size != self.slot_count * THUMB_BYTES:
+                # Atlas and index disagree, start over rather than serve garbage.
+                self.entries = {}
+                self.free_slots = []
+                self.slot_count = 0
+                self._file.truncate(0)
+            self._remap()
+            return True
+        except Exception as e:
+            logging.error("Failed to open thumbnail cache: %s", e)
+            self.close()
+            return False
+
+    def close(self):
+        self.save()
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.error("Failed to read thumbnail index: %s", e)
+            return
+        if data.get("version") != ATLAS_VERSION or data.get("slot_bytes") != THUMB_BYTES:
+            return
+        self.entries = data.get("entries", {})
+        self.failed = data.get("failed", {})
+        self.slot_count = data.get("slot_count", 0)
+        used = {e["slot"] for e in self.entries.values()}
+        self.free_slots = [s for s in range(self.slot_count) if s not in used]
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            payload = {
+                "version": ATLAS_VERSION,
+                "slot_bytes": THUMB_BYTES,
+                "slot_count": self.slot_count,
+                "entries": dict(self.entries),
+                "failed": dict(self.failed),
+            }
+            if self._mm is not None:
+                self._mm.flush()
+            self.dirty = False
+        try:
+            write_json_atomic(self.index_path, payload)
+        except Exception as e:
+            logging.error("Failed to save thumbnail index: %s", e)
+
+    def _remap(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self.slot_count:
+            self._mm = mmap.mmap(self._file.fileno(), self.slot_count * THUMB_BYTES)
+
+    def _grow(self):
+        new_count = min(self.slot_count + GROW_SLOTS, self.max_slots)
+        if new_count <= self.slot_count:
+            return False
+        self._file.truncate(new_count * THUMB_BYTES)
+        self.free_slots.extend(range(self.slot_count, new_count))
+        self.slot_count = new_count
+        self._remap()
+        return True
+
+    def _evict_one(self):
+        path = min(self.entries, key=lambda p: self.entries[p]["used"])
+        self.free_slots.append(self.entries.pop(path)["slot"])
+
+    def get(self, path):
+        """Return the cached RGB888 bytes for path, or None on a miss."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.invalidate(path)
+            return None
+        with self._lock:
+            entry = self.entries.get(path)
+            if self._mm is None or entry is None:
+                self.misses += 1
+                return None
+            if entry["mtime"] != st.st_mtime_ns or entry["size"] != st.st_size:
+                self.free_slots.append(self.entries.pop(path)["slot"])
+                self.dirty = True
+                self.misses += 1
+                return None
+            entry["used"] = time.time()
+            self.hits += 1
+            offset = entry["slot"] * THUMB_BYTES
+            return self._mm[offset:offset + THUMB_BYTES]
+
+    def put(self, path, pixels):
+        if len(pixels) != THUMB_BYTES or self._file is None:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        with self._lock:
+            try:
+                old = self.entries.pop(path, None)
+                if old is not None:
+                    self.free_slots.append(old["slot"])
+                if not self.free_slots and not self._grow():
+                    self._evict_one()
+                slot = self.free_slots.pop()
+                offset = slot * THUMB_BYTES
+                self._mm[offset:offset + THUMB_BYTES] = pixels
+                self.entries[path] = {
+                    "slot": slot,
+                    "mtime": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "used": time.time(),
+                }
+                self.dirty = True
+                return True
+            except Exception as e:
+                logging.error("Failed to store thumbnail: %s", e)
+                return False
+
+    @staticmethod
+    def _signature(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def mark_failed(self, path):
+        """Remember that path could not be turned into a thumbnail."""
+        signature = self._signature(path)
+        with self._lock:
+            self.failed[path] = signature
+            self.dirty = True
+
+    def is_failed(self, path):
+        """Check whether path failed before and has not changed since."""
+        with self._lock:
+            if path not in self.failed:
+                return False
+            old = self.failed[path]
+        if self._signature(path) == old:
+            return True
+        with self._lock:
+            self.failed.pop(path, None)
+            self.dirty = True
+        return False
+
+    def invalidate(self, path):
+        with self._lock:
+            entry = self.entries.pop(path, None)
+            if entry is not None:
+                self.free_slots.append(entry["slot"])
+                self.dirty = True
+
+
+def decode_thumbnail(path):
+    """Decode path into cropped RGB888 thumbnail bytes using Pillow.
+
+    JPEG previews are decoded at a reduced DCT scale via draft(), and the
+    remaining downscale goes through resize's reducing_gap fast path.
+    """
+    with Image.open(path) as im:
+        im.draft("RGB", (THUMB_WIDTH, THUMB_HEIGHT))
+        if im.mode != "RGB":
+            im = im.convert("RGB")
+        w, h = im.size
+        scale = max(THUMB_WIDTH / w, THUMB_HEIGHT / h)
+        crop_w = THUMB_WIDTH / scale
+        crop_h = THUMB_HEIGHT / scale
+        left = (w - crop_w) / 2
+        top = (h - crop_h) / 2
+        thumb = im.resize(
+            (THUMB_WIDTH, THUMB_HEIGHT),
+            Image.Resampling.BILINEAR,
+            box=(left, top, left + crop_w, top + crop_h),
+            reducing_gap=2.0,
+        )
+        return thumb.tobytes()
@@ -10,17 +10,35 @@ import re
 import pathlib
 import logging
 import argparse
+import threading
+import time
+import asyncio
+import errno
 
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLabel, QLineEdit, QCheckBox, QSlider, QComboBox,
-                             QStackedWidget, QListWidget, QListWidgetItem, QSystemTrayIcon,
+                             QStackedWidget, QListWidget, QListView, QSystemTrayIcon,
                              QMenu, QFrame, QSizePolicy, QGraphicsDropShadowEffect,
-                             QStyledItemDelegate, QStyle, QFileDialog)
-from PyQt6.QtCore import Qt, QSize, QThread, pyqtSignal, QObject, QTimer, QRect, QPropertyAnimation, QEasingCurve, QVariant, QUrl
-from PyQt6.QtGui import QIcon, QPixmap, QImage, QAction, QColor, QPainter, QDesktopServices
-from process_manager import WallpaperProcessManager
+                             QStyledItemDelegate, QStyle, QStyleOptionViewItem, QFileDialog)
+from PyQt6.QtCore import Qt, QSize, QThread, pyqtSignal, pyqtSlot, QObject, QTimer, QSocketNotifier, QRect, QPropertyAnimation, QEasingCurve, QVariant, QUrl, QRunnable, QThreadPool, QAbstractListModel, QSortFilterProxyModel, QModelIndex, QPersistentModelIndex, QMetaType
+from PyQt6.QtGui import QIcon, QPixmap, QPixmapCache, QImage, QAction, QColor, QPainter, QDesktopServices
+try:
+    from PyQt6.QtDBus import QDBusConnection, QDBusInterface, QDBusArgument, QDBusMessage, QDBusObjectPath
+except ImportError:
+    QDBusConnection = None
+from process_manager import WallpaperProcessManager, COLD_START_STAGGER, CRASH_LOOP_WINDOW, describe_exit, exit_signal
+from proc_stats import SAMPLE_INTERVAL
+from launch_limits import DEFAULT_PROFILES, user_scope_available, probe_user_scope
+from launch_metrics import LaunchHistory
+from fps_governor import FpsGovernor, GOVERNOR_INTERVAL, SYSFS_ROOT, command_fps, with_fps
+from file_utils import PROC_ROOT
+from library_index import LibraryIndex, scan_roots, path_in_roots, ROOT_OK, DEFAULT_ROOT_BUDGET
+import thumbnail_cache
+from thumbnail_cache import ThumbnailCache, THUMB_WIDTH, THUMB_HEIGHT
+from search_index import SearchIndex, tokenize, SUBSTRING
+from metadata_store import MetadataStore, FACETS
+from inotify_watch import Inotify
+from project_properties import PropertyCache, ListingParser, read_listing, describe_property, LISTING_COMPLETE, LISTING_TIMEOUT
 
 CONFIG_FILE = pathlib.Path(os.getenv("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))) / "linux-wallpaperengine-gui" / "wpe_gui_config.json"
 LOCALE_DIR = (pathlib.Path(__file__).parent / "locales").absolute()
@@ -51,10 +69,10 @@ QCheckBox::indicator { width: 16px; height: 16px; border-radius: 4px; border: 1p
 QCheckBox::indicator:checked { background: #0A84FF; border-color: #0A84FF; }
 QSlider::groove:horizontal { border: 1px solid #3A3A3A; height: 4px; background: #3A3A3A; margin: 2px 0; border-radius: 2px; }
 QSlider::handle:horizontal { background: #FFFFFF; border: 1px solid #5c5c5c; width: 18px; height: 18px; margin: -8px 0; border-radius: 9px; }
-QListWidget#WallpaperGrid { background-color: transparent; border: none; outline: none; padding: 20px 20px 20px 100px; }
-QListWidget#WallpaperGrid::item { background-color: #2D2D2D; border: 1px solid #3A3A3A; border-radius: 12px; margin: 15px; color: #FFFFFF; padding: 5px; }
-QListWidget#WallpaperGrid::item:selected { background-color: #3A3A3A; border: 2px solid #0A84FF; color: #FFFFFF; }
-QListWidget#WallpaperGrid::item:hover { background-color: #353535; border: 1px solid #4A4A4A; }
+QListView#WallpaperGrid { background-color: transparent; border: none; outline: none; padding: 20px 20px 20px 100px; }
+QListView#WallpaperGrid::item { background-color: #2D2D2D; border: 1px solid #3A3A3A; border-radius: 12px; margin: 15px; color: #FFFFFF; padding: 5px; }
+QListView#WallpaperGrid::item:selected { background-color: #3A3A3A; border: 2px solid #0A84FF; color: #FFFFFF; }
+QListView#WallpaperGrid::item:hover { background-color: #353535; border: 1px solid #4A4A4A; }
 QScrollBar:vertical { border: none; background: transparent; width: 10px; margin: 0px; }
 QScrollBar::handle:vertical { background: rgba(255, 255, 255, 0.1); min-height: 40px; border-radius: 5px; margin: 2px; }
 QScrollBar::handle:vertical:hover { background: rgba(255, 255, 255, 0.2); }
@@ -66,6 +84,7 @@ QLabel#PreviewBox { background-color: #1E1E1E; border: 1px solid #3A3A3A; border
 
 class Worker(QObject):
     finished = pyqtSignal(object)
+    progress = pyqtSignal(object)
     def __init__(self, func, *args, **kwargs):
         super().__init__()
         self.func = func
@@ -75,6 +94,410 @@ class Worker(QObject):
         result = self.func(*self.args, **self.kwargs)
         self.finished.emit(result)
 
+def crop_thumbnail(image):
+    image = image.scaled(THUMB_WIDTH, THUMB_HEIGHT, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+    rect = QRect(0, 0, THUMB_WIDTH, THUMB_HEIGHT)
+    rect.moveCenter(image.rect().center())
+    return image.copy(rect).convertToFormat(QImage.Format.Format_RGB888)
+
+class ThumbnailTask(QRunnable):
+    def __init__(self, key, path, signal):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.path = path
+        self.signal = signal
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            return
+        image = QImage()
+        try:
+            if thumbnail_cache.Image is not None:
+                pixels = thumbnail_cache.decode_thumbnail(self.path)
+                image = QImage(pixels, THUMB_WIDTH, THUMB_HEIGHT, THUMB_WIDTH * 3, QImage.Format.Format_RGB888).copy()
+        except Exception as e:
+            logging.info("Pillow could not decode %s: %s", self.path, e)
+        if image.isNull() and not self.cancelled:
+            # QImage (unlike QPixmap) is safe to use off the GUI thread
+            source = QImage(self.path)
+            if not source.isNull():
+                image = crop_thumbnail(source)
+        if not self.cancelled:
+            self.signal.emit(self, image)
+
+class ThumbnailLoader(QObject):
+    """Decodes thumbnails on a thread pool and caches them in the atlas."""
+    thumbnail_ready = pyqtSignal(str, QImage)
+    _decoded = pyqtSignal(object, QImage)
+
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.pending = {}
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max(2, min(4, QThread.idealThreadCount())))
+        self._decoded.connect(self.on_decoded)
+
+    def cached(self, path):
+        pixels = self.cache.get(path)
+        if pixels is None:
+            return None
+        return QImage(pixels, THUMB_WIDTH, THUMB_HEIGHT, THUMB_WIDTH * 3, QImage.Format.Format_RGB888).copy()
+
+    def request(self, key, path):
+        if key in self.pending or self.cache.is_failed(path):
+            return
+        task = ThumbnailTask(key, path, self._decoded)
+        self.pending[key] = task
+        self.pool.start(task)
+
+    def cancel(self, key):
+        task = self.pending.pop(key, None)
+        if task is None:
+            return
+        task.cancelled = True
+        self.pool.tryTake(task)
+
+    def cancel_except(self, keys):
+        for key in [k for k in self.pending if k not in keys]:
+            self.cancel(key)
+
+    def cancel_all(self):
+        self.cancel_except(())
+
+    def on_decoded(self, task, image):
+        if self.pending.get(task.key) is not task:
+            return
+        del self.pending[task.key]
+        if image.isNull():
+            # Missing or undecodable; skipped until the preview changes
+            self.cache.mark_failed(task.path)
+        else:
+            self.cache.put(task.path, image.constBits().asstring(image.sizeInBytes()))
+            self.thumbnail_ready.emit(task.key, image)
+        if not self.pending:
+            self.cache.save()
+
+class PropertyPrefetchTask(QRunnable):
+    def __init__(self, cache, wallpaper_id, item_dir, signal):
+        super().__init__()
+        self.cache = cache
+        self.wallpaper_id = wallpaper_id
+        self.item_dir = item_dir
+        self.signal = signal
+
+    def run(self):
+        props = self.cache.listing(self.wallpaper_id, self.item_dir)
+        self.signal.emit(self.wallpaper_id, props is not None)
+
+class PropertyPrefetcher(QObject):
+    """Reads property listings of selected or hovered items ahead of time."""
+    listing_ready = pyqtSignal(str)
+    _done = pyqtSignal(str, bool)
+
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.pending = set()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
+        self._done.connect(self.on_done)
+
+    def prefetch(self, wallpaper_id, item_dir):
+        if wallpaper_id in self.pending:
+            return
+        self.pending.add(wallpaper_id)
+        self.pool.start(PropertyPrefetchTask(self.cache, wallpaper_id, item_dir, self._done))
+
+    def on_done(self, wallpaper_id, found):
+        self.pending.discard(wallpaper_id)
+        if found:
+            self.listing_ready.emit(wallpaper_id)
+        if not self.pending:
+            self.cache.save()
+
+class WallpaperModel(QAbstractListModel):
+    """Library contents as a plain Python list of wallpaper dicts.
+
+    The model also keeps a SearchIndex in step with its rows. Added or
+    changed items are queued and indexed in short slices from the event
+    loop so big batches never stall the UI; search() covers items still in
+    the queue with a plain substring match. Facet metadata lives in a
+    MetadataStore, which is cheap enough to update immediately.
+    """
+    search_index_ready = pyqtSignal()
+    # Emitted whenever rows_by_id has been rebuilt. A batch of row removals
+    # only rebuilds it once, after its last rowsRemoved.
+    rows_reindexed = pyqtSignal()
+    INDEX_SLICE = 0.008
+
+    def __init__(self, placeholder, parent=None):
+        super().__init__(parent)
+        self.wallpapers = []
+        self.rows_by_id = {}
+        self.thumbnails = {}
+        self.placeholder = placeholder
+        self.search_index = SearchIndex()
+        self.metadata = MetadataStore()
+        self.index_queue = {}
+        self.index_timer = QTimer(self)
+        self.index_timer.setInterval(0)
+        self.index_timer.timeout.connect(self._drain_index)
+
+    def _queue_index(self, wallpapers):
+        for w in wallpapers:
+            self.index_queue[w["id"]] = w
+            self.metadata.add(w)
+        if self.index_queue and not self.index_timer.isActive():
+            self.index_timer.start()
+
+    def _unindex(self, wallpapers):
+        for w in wallpapers:
+            self.index_queue.pop(w["id"], None)
+            self.search_index.remove(w["id"])
+            self.metadata.remove(w["id"])
+
+    def _drain_index(self):
+        deadline = time.perf_counter() + self.INDEX_SLICE
+        queue = self.index_queue
+        while queue and time.perf_counter() < deadline:
+            wp_id = next(iter(queue))
+            self.search_index.add(queue.pop(wp_id))
+        if not queue:
+            self.index_timer.stop()
+            self.search_index_ready.emit()
+
+    def search(self, query):
+        """Return {wallpaper id: score} for query, or None for an empty query."""
+        scores = self.search_index.search(query)
+        if scores is None or not self.index_queue:
+            return scores
+        terms = tokenize(query)
+        for wp_id, w in self.index_queue.items():
+            text = " ".join([w["title"], wp_id, *(w.get("tags") or ()),
+                             w.get("description") or ""]).casefold()
+            if all(t in text for t in terms):
+                scores[wp_id] = SUBSTRING * len(terms)
+        return scores
+
+    def filter(self, query, facets):
+        """Return (scores, facet counts) for a query and a facet selection.
+
+        facets maps a facet name to the set of selected category codes.
+        Scores are None when neither the query nor the facets restrict.
+        """
+        scores = self.search(query)
+        store = self.metadata
+        base = None if scores is None else store.mask_of(scores)
+        counts = store.counts(facets, base)
+        if any(facets.values()):
+            ids = store.ids_in(store.filter_mask(facets, base))
+            if scores is None:
+                scores = dict.fromkeys(ids, 0.0)
+            else:
+                scores = {wp_id: scores[wp_id] for wp_id in ids}
+        return scores, counts
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.wallpapers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        w = self.wallpapers[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return w["title"]
+        if role == Qt.ItemDataRole.DecorationRole:
+            if not w.get("preview"):
+                return None
+            return self.thumbnails.get(w["id"], self.placeholder)
+        if role == Qt.ItemDataRole.UserRole:
+            return w
+        return None
+
+    def _reindex(self):
+        self.rows_by_id = {w["id"]: row for row, w in enumerate(self.wallpapers)}
+        self.rows_reindexed.emit()
+
+    def set_wallpapers(self, wallpapers):
+        self.beginResetModel()
+        self.wallpapers = sorted(wallpapers, key=lambda w: w["title"].lower())
+        self.thumbnails = {}
+        self._reindex()
+        self.search_index.clear()
+        self.metadata.clear()
+        self.index_queue = {}
+        self._queue_index(self.wallpapers)
+        self.endResetModel()
+
+    def merge_wallpapers(self, wallpapers):
+        new = []
+        seen = set(self.rows_by_id)
+        for w in wallpapers:
+            if w["id"] not in seen:
+                seen.add(w["id"])
+                new.append(w)
+        if not new:
+            return 0
+        first = len(self.wallpapers)
+        self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+        self.wallpapers.extend(new)
+        self._reindex()
+        self.endInsertRows()
+        self._queue_index(new)
+        self.sort(0)
+        return len(new)
+
+    def sync_wallpapers(self, wallpapers, keep=None):
+        """Make the model hold exactly wallpapers without resetting it.
+
+        Rows that are gone are removed, changed ones are updated in place and
+        new ones merged, so selection, scroll position and loaded thumbnails
+        of untouched rows survive. Existing rows for which keep(w) is true
+        are never removed.
+        """
+        incoming = {w["id"]: w for w in wallpapers}
+        self._remove_rows([row for row, w in enumerate(self.wallpapers)
+                           if w["id"] not in incoming and not (keep and keep(w))])
+        resort = self._update_rows(incoming)
+        added = self.merge_wallpapers(wallpapers)
+        if resort and not added:
+            self.sort(0)
+        return added
+
+    def apply_changes(self, updated, removed_paths):
+        """Update, add or remove individual items after a targeted refresh.
+
+        Thumbnails of every updated item are dropped so they are fetched
+        again; the thumbnail cache decides whether the preview really changed.
+        """
+        for w in updated:
+            self.thumbnails.pop(w["id"], None)
+        self._remove_rows([row for row, w in enumerate(self.wallpapers)
+                           if w["path"] in removed_paths])
+        resort = self._update_rows({w["id"]: w for w in updated})
+        added = self.merge_wallpapers(updated)
+        if resort and not added:
+            self.sort(0)
+        return added
+
+    def _remove_rows(self, rows):
+        # Remove contiguous runs from the bottom up so row numbers stay valid
+        while rows:
+            last = rows.pop()
+            first = last
+            while rows and rows[-1] == first - 1:
+                first = rows.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for w in self.wallpapers[first:last + 1]:
+                self.thumbnails.pop(w["id"], None)
+            self._unindex(self.wallpapers[first:last + 1])
+            del self.wallpapers[first:last + 1]
+            self.endRemoveRows()
+        self._reindex()
+
+    def _update_rows(self, incoming):
+        """Replace rows whose data changed; returns True if a resort is needed."""
+        resort = False
+        for wp_id, new in incoming.items():
+            row = self.rows_by_id.get(wp_id)
+            if row is None or self.wallpapers[row] == new:
+                continue
+            resort = resort or new["title"] != self.wallpapers[row]["title"]
+            self.wallpapers[row] = new
+            self.thumbnails.pop(wp_id, None)
+            self._queue_index([new])
+            idx = self.index(row, 0)
+            self.dataChanged.emit(idx, idx)
+        return resort
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        old_rows = dict(self.rows_by_id)
+        self.wallpapers.sort(key=lambda w: w["title"].lower(),
+                             reverse=order == Qt.SortOrder.DescendingOrder)
+        self._reindex()
+        persistent = self.persistentIndexList()
+        if persistent:
+            ids = [self.wallpapers[row]["id"] for row in range(len(self.wallpapers))]
+            by_old_row = {old_rows[wp_id]: self.rows_by_id[wp_id] for wp_id in ids}
+            self.changePersistentIndexList(
+                persistent,
+                [self.index(by_old_row[i.row()], 0) for i in persistent])
+        self.layoutChanged.emit()
+
+    def wallpaper_at(self, row):
+        return self.wallpapers[row]
+
+    def set_thumbnail(self, wp_id, icon):
+        row = self.rows_by_id.get(wp_id)
+        if row is None:
+            return
+        self.thumbnails[wp_id] = icon
+        idx = self.index(row, 0)
+        self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DecorationRole])
+
+class WallpaperFilterModel(QSortFilterProxyModel):
+    """Shows only the wallpapers in a search result, best matches first.
+
+    The result is a {wallpaper id: score} dict computed by the search
+    index in one go, so a query change is a single layout change instead
+    of a per-item update. None shows everything in source (title) order, as
+    does a result set without rank (e.g. one narrowed by facets only).
+    """
+    # Past this many results ranking is skipped; such broad queries carry
+    # little signal and sorting them would cost more than it is worth.
+    RANK_LIMIT = 5000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.scores = None
+        self.accepted_rows = set()
+
+    def setSourceModel(self, model):
+        # The model reindexes before it ends an insert, sort or reset, so
+        # accepted_rows is up to date by the time the proxy re-filters rows.
+        # rowsRemoved is not used: in a batch of removals rows_by_id is only
+        # valid again after the last one.
+        model.rows_reindexed.connect(self._map_rows)
+        super().setSourceModel(model)
+
+    def _map_rows(self, *args):
+        if self.scores is None:
+            return
+        rows_by_id = self.sourceModel().rows_by_id
+        self.accepted_rows = {rows_by_id[i] for i in self.scores if i in rows_by_id}
+
+    def set_scores(self, scores, rank=True):
+        if scores is None and self.scores is None:
+            return
+        self.scores = scores
+        self._map_rows()
+        # Drop the ranking first so filtering does not insert rows in sorted
+        # order one lessThan() call at a time. invalidate() rebuilds the
+        # mapping behind one layoutChanged; invalidateRowsFilter() would emit
+        # a rowsRemoved/rowsInserted pair per scattered range, thousands of
+        # them for a broad query on a big library.
+        self.sort(-1)
+        self.invalidate()
+        if rank and scores and len(scores) <= self.RANK_LIMIT:
+            self.sort(0)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.scores is None or source_row in self.accepted_rows
+
+    def lessThan(self, left, right):
+        wallpapers = self.sourceModel().wallpapers
+        l_score = self.scores.get(wallpapers[left.row()]["id"], 0.0) if self.scores else 0.0
+        r_score = self.scores.get(wallpapers[right.row()]["id"], 0.0) if self.scores else 0.0
+        if l_score != r_score:
+            return l_score > r_score
+        return left.row() < right.row()
+
 class I18n:
     def __init__(self):
         self.locale_data = {}
@@ -96,122 +519,544 @@ class I18n:
         return text
 
 class WallpaperDelegate(QStyledItemDelegate):
+    HOVER_SCALE = 1.08
+    SCALE_STEP = 0.02
+    # Enough for a few screens of composed cards in both states
+    CARD_CACHE_KB = 64 * 1024
+    # Style states that change how a card looks
+    CARD_STATE = (QStyle.StateFlag.State_Selected | QStyle.StateFlag.State_MouseOver |
+                  QStyle.StateFlag.State_HasFocus | QStyle.StateFlag.State_Active |
+                  QStyle.StateFlag.State_Enabled)
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.scales = {}
-        self.current_scales = {}
-        self.timer = QTimer()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), self.CARD_CACHE_KB))
+        # QPersistentModelIndex -> [current scale, target scale]. Cards at
+        # rest are dropped, so only hovered or moving cards have an entry.
+        self.anims = {}
+        # Only runs while at least one card is mid-transition
+        self.timer = QTimer(self)
+        self.timer.setInterval(16)
         self.timer.timeout.connect(self.update_animations)
-        self.timer.start(16)
+        # Row removals come in bursts of many ranges; prune once after them
+        self.prune_timer = QTimer(self)
+        self.prune_timer.setSingleShot(True)
+        self.prune_timer.setInterval(0)
+        self.prune_timer.timeout.connect(self.prune)
+        if parent is not None and parent.model() is not None:
+            model = parent.model()
+            model.rowsRemoved.connect(self.prune_timer.start)
+            model.modelReset.connect(self.prune)
+            model.layoutChanged.connect(self.prune)
+
+    def prune(self):
+        for key in [k for k in self.anims if not k.isValid()]:
+            del self.anims[key]
+        if not self.anims:
+            self.timer.stop()
+
+    def animate_to(self, index, target):
+        """Set the target scale for index and return its current scale."""
+        key = QPersistentModelIndex(index)
+        state = self.anims.get(key)
+        if state is None:
+            if target == 1.0:
+                return 1.0
+            state = self.anims[key] = [1.0, target]
+        state[1] = target
+        if state[0] != target and not self.timer.isActive():
+            self.timer.start()
+        return state[0]
 
     def update_animations(self):
-        changed = False
-        step = 0.02
-        for index_ptr, target in self.scales.items():
-            curr = self.current_scales.get(index_ptr, 1.0)
-            if abs(curr - target) > 0.001:
-                if curr < target:
-                    self.current_scales[index_ptr] = min(curr + step, target)
-                else:
-                    self.current_scales[index_ptr] = max(curr - step, target)
-                changed = True
-
-        if changed and self.parent():
-            self.parent().viewport().update()
-
-    def paint(self, painter, option, index):
-        painter.save()
+        view = self.parent()
+        moving = False
+        for key, state in list(self.anims.items()):
+            if not key.isValid():
+                del self.anims[key]
+                continue
+            curr, target = state
+            if curr == target:
+                continue
+            if curr < target:
+                state[0] = min(curr + self.SCALE_STEP, target)
+            else:
+                state[0] = max(curr - self.SCALE_STEP, target)
+            if abs(state[0] - target) < 0.001:
+                state[0] = target
+            if state[0] != target:
+                moving = True
+            elif target == 1.0:
+                del self.anims[key]
+            if view is not None:
+                # The scaled card overhangs its cell, repaint a margin around it
+                rect = view.visualRect(QModelIndex(key))
+                m = int(rect.width() * (self.HOVER_SCALE - 1.0)) + 4
+                view.viewport().update(rect.adjusted(-m, -m, m, m))
+        if not moving:
+            self.timer.stop()
+
+    def card_pixmap(self, option, index, shadow):
+        """Return the fully composed card for index, rendering it on a miss.
+
+        Cards are cached per item, size, relevant style state and thumbnail,
+        so repaints and animation frames only blit (and scale) a pixmap.
+        """
+        w = index.data(Qt.ItemDataRole.UserRole)
+        icon = index.data(Qt.ItemDataRole.DecorationRole)
+        rect = option.rect
+        state = (option.state & self.CARD_STATE).value
+        key = (f"wpcard/{w['id']}/{w['title']}/{icon.cacheKey() if icon else 0}/"
+               f"{rect.width()}x{rect.height()}/{state}/{int(shadow)}")
+        card = QPixmapCache.find(key)
+        if card is not None:
+            self.cache_hits += 1
+            return card
+        self.cache_misses += 1
+
+        dpr = option.widget.devicePixelRatioF() if option.widget else 1.0
+        card = QPixmap(int((rect.width() + 2) * dpr), int((rect.height() + 2) * dpr))
+        card.setDevicePixelRatio(dpr)
+        card.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(card)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        opt = QStyleOptionViewItem(option)
+        opt.rect = QRect(0, 0, rect.width(), rect.height())
+        if shadow:
+            shadow_color = QColor(0, 0, 0, 60)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(shadow_color)
+            painter.drawRoundedRect(opt.rect.adjusted(2, 2, 2, 2), 12, 12)
+        super().paint(painter, opt, index)
+        painter.end()
+        QPixmapCache.insert(key, card)
+        return card
+
+    def cache_stats(self):
+        total = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / total if total else 0.0,
+        }
 
+    def paint(self, painter, option, index):
+        is_hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        scale = self.animate_to(index, self.HOVER_SCALE if is_hovered else 1.0)
+        card = self.card_pixmap(option, index, is_hovered and scale > 1.0)
 
-        idx_id = index.row()
-
-
-        is_hovered = option.state & QStyle.StateFlag.State_MouseOver
-        self.scales[idx_id] = 1.08 if is_hovered else 1.0
-
-
-        scale = self.current_scales.get(idx_id, 1.0)
-
+        painter.save()
         if scale > 1.0:
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
             painter.translate(option.rect.center())
             painter.scale(scale, scale)
             painter.translate(-option.rect.center())
-
-
-            if is_hovered:
-                shadow_color = QColor(0, 0, 0, 60)
-                painter.setPen(Qt.PenStyle.NoPen)
-                painter.setBrush(shadow_color)
-                painter.drawRoundedRect(option.rect.adjusted(2, 2, 2, 2), 12, 12)
-
-        super().paint(painter, option, index)
+        painter.drawPixmap(option.rect.topLeft(), card)
         painter.restore()
 
-class WallpaperChangeHandler(FileSystemEventHandler):
-    def __init__(self, signal):
-        self.signal = signal
+DEFAULT_WATCH_BUDGET = 4096
+WATCH_POLL_INTERVAL = 30000
 
-    def on_any_event(self, event):
-        if event.is_directory:
-            return
-        # Trigger update on file changes (creation, deletion, modification)
-        self.signal.emit()
+WATCH_INOTIFY = "inotify"
+WATCH_POLL = "poll"
 
 class LibraryWatcher(QObject):
-    # Signal to notify the app that the library needs refreshing (debounced)
-    library_changed = pyqtSignal()
-    # Internal signal from worker thread
-    _raw_change = pyqtSignal()
-
-    def __init__(self):
+    """Watches library roots and items without recursive inotify watches.
+
+    All watches share a single inotify instance that is read on the GUI
+    thread, so a library of any size uses one of the user's inotify
+    instances. Every root gets a shallow watch, which sees items being
+    added and removed. While the watch budget allows it each item
+    directory gets a shallow watch as well, which covers its project.json
+    and preview. Past the budget, or once the kernel runs out of watches,
+    items are instead checked by a low-frequency stat poller; roots that
+    could not be watched at all are polled for new and removed items.
+    """
+    # Item directories touched during the debounce window
+    items_changed = pyqtSignal(object)
+    # Emitted whenever the watch count or strategy changes
+    strategy_changed = pyqtSignal()
+    # Internal signal from the poll thread
+    _raw_change = pyqtSignal(object)
+
+    def __init__(self, budget=DEFAULT_WATCH_BUDGET):
         super().__init__()
-        self.observer = Observer()
-        self.handler = WallpaperChangeHandler(self._raw_change)
-        self.watched_paths = set()
+        self.inotify = None
+        self.notifier = None
+        # Why inotify cannot be used at all, if it cannot
+        self.inotify_error = None
+        self.budget = budget
+        self.roots = set()
+        self.items = set()
+        self.strategy = WATCH_INOTIFY
+        self.pending_items = set()
+        # Written by the poll thread, pruned by update_watches()
+        self.poll_signatures = {}
+        self._poll_lock = threading.Lock()
+        self._poll_thread = None
 
         # Debounce timer
         self.timer = QTimer()
         self.timer.setSingleShot(True)
         self.timer.setInterval(2000)  # Wait 2 seconds after last event
-        self.timer.timeout.connect(self.library_changed.emit)
+        self.timer.timeout.connect(self.flush_changes)
 
-        self._raw_change.connect(self.on_raw_change)
+        self.poll_timer = QTimer()
+        self.poll_timer.setInterval(WATCH_POLL_INTERVAL)
+        self.poll_timer.timeout.connect(self.poll_items)
 
-    def on_raw_change(self):
-        # Restart timer to debounce
-        self.timer.start()
+        self._raw_change.connect(self.on_raw_change)
 
-    def update_watches(self, directories):
-        # efficiently update watches
-        new_paths = set(directories)
-        if new_paths == self.watched_paths:
+    def _open_inotify(self):
+        if self.inotify is None and self.inotify_error is None:
+            try:
+                self.inotify = Inotify()
+            except OSError as e:
+                logging.error("Failed to start inotify, polling the library instead: %s", e)
+                self.inotify_error = e.strerror or str(e)
+                return False
+            self.notifier = QSocketNotifier(self.inotify.fd, QSocketNotifier.Type.Read, self)
+            self.notifier.activated.connect(self.on_inotify_ready)
+        return self.inotify is not None
+
+    def on_inotify_ready(self, *args):
+        try:
+            events = self.inotify.read_events()
+        except OSError as e:
+            logging.error("Failed to read inotify events: %s", e)
+            return
+        if events:
+            self.on_raw_change([path for path, _mask in events])
+
+    def item_dir_for(self, path):
+        """Map a changed path to the workshop item directory it belongs to."""
+        root = max((r for r in self.roots if path.startswith(os.path.join(r, ""))),
+                   key=len, default=None)
+        if root is None:
+            return None
+        first = os.path.relpath(path, root).split(os.sep)[0]
+        if first == "project.json":
+            # The root is itself a single wallpaper
+            return root
+        return os.path.join(root, first)
+
+    def on_raw_change(self, paths):
+        for path in paths:
+            item_dir = self.item_dir_for(path)
+            if item_dir is not None:
+                self.pending_items.add(item_dir)
+        if self.pending_items:
+            # Restart timer to debounce
+            self.timer.start()
+
+    def flush_changes(self):
+        items, self.pending_items = self.pending_items, set()
+        if items:
+            self.items_changed.emit(items)
+
+    def update_watches(self, roots, item_dirs):
+        roots = {r for r in roots if os.path.isdir(r)}
+        items = {d for d in item_dirs if d not in roots}
+        if roots == self.roots and items == self.items:
             return
+        self.roots = roots
+        self.items = items
+
+        if not self._open_inotify():
+            self.strategy = WATCH_POLL
+            wanted = set()
+        elif len(roots) + len(items) <= self.budget:
+            self.strategy = WATCH_INOTIFY
+            wanted = roots | items
+        else:
+            self.strategy = WATCH_POLL
+            wanted = set(roots)
+
+        if self.inotify is not None:
+            for path in [p for p in self.inotify.wds if p not in wanted]:
+                self.inotify.remove_watch(path)
+            # Roots first: they are what notices new items
+            for path in sorted(wanted - set(self.inotify.wds), key=lambda p: p not in roots):
+                try:
+                    self.inotify.add_watch(path)
+                except OSError as e:
+                    if e.errno != errno.ENOSPC:
+                        logging.error("Failed to watch %s: %s", path, e)
+                        continue
+                    # The kernel's max_user_watches is shared with every
+                    # other program; poll the items instead of failing.
+                    for item in [p for p in self.inotify.wds if p not in roots]:
+                        self.inotify.remove_watch(item)
+                    self.budget = len(self.inotify.wds)
+                    self.strategy = WATCH_POLL
+                    logging.error("Failed to watch %s: %s; polling the library items instead", path, e)
+                    break
+
+        if self.strategy == WATCH_POLL or self.unwatched_roots():
+            with self._poll_lock:
+                self.poll_signatures = {k: v for k, v in self.poll_signatures.items()
+                                        if k in items or k in roots}
+            if not self.poll_timer.isActive():
+                self.poll_timer.start()
+                self.poll_items()
+        else:
+            self.poll_timer.stop()
+            with self._poll_lock:
+                self.poll_signatures = {}
+        self.strategy_changed.emit()
 
-        if self.observer.is_alive():
-            self.observer.stop()
-            self.observer.join()
+    def watch_count(self):
+        return len(self.inotify.wds) if self.inotify is not None else 0
 
-        self.observer = Observer()
-        self.watched_paths = new_paths
+    def unwatched_roots(self):
+        watched = self.inotify.wds if self.inotify is not None else {}
+        return [r for r in self.roots if r not in watched]
 
-        for d in directories:
-            if os.path.isdir(d):
-                try:
-                    self.observer.schedule(self.handler, d, recursive=True)
-                except Exception as e:
-                    print(f"Failed to watch {d}: {e}")
+    def poll_items(self):
+        if self._poll_thread is not None and self._poll_thread.is_alive():
+            return
+        items = list(self.items) if self.strategy == WATCH_POLL else []
+        self._poll_thread = threading.Thread(
+            target=self._poll_worker, args=(items, self.unwatched_roots()),
+            name="library-poll", daemon=True)
+        self._poll_thread.start()
+
+    def _poll_worker(self, items, roots):
+        changed = []
+        with self._poll_lock:
+            old_signatures = dict(self.poll_signatures)
+        signatures = {}
+        for item_dir in items:
+            try:
+                dir_st = os.stat(item_dir)
+                proj_st = os.stat(os.path.join(item_dir, "project.json"))
+                sig = (dir_st.st_mtime_ns, proj_st.st_mtime_ns, proj_st.st_size)
+            except OSError:
+                sig = None
+            signatures[item_dir] = sig
+            if old_signatures.get(item_dir, sig) != sig:
+                changed.append(item_dir)
+        for root in roots:
+            # A root's signature is its listing, so new and removed items show up
+            try:
+                sig = frozenset(os.listdir(root))
+            except OSError:
+                sig = frozenset()
+            signatures[root] = sig
+            old = old_signatures.get(root, sig)
+            changed.extend(os.path.join(root, name) for name in old ^ sig)
+        with self._poll_lock:
+            self.poll_signatures.update(signatures)
+        if changed:
+            self._raw_change.emit(changed)
 
+    def stop(self):
+        self.poll_timer.stop()
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+        if self.inotify is not None:
+            self.inotify.close()
+
+DEFAULT_IDLE_PAUSE_SECONDS = 300
+IDLE_POLL_INTERVAL = 5000
+
+class SessionMonitor(QObject):
+    """Reports when the session is locked or the screen blanks or idles.
+
+    Listens on D-Bus for the freedesktop (and GNOME) ScreenSaver
+    ActiveChanged signal, which desktops emit when the screen saver or
+    blanking kicks in, and for logind's Lock/Unlock. Without a session bus
+    it falls back to polling the X idle time through xprintidle.
+    """
+    locked_changed = pyqtSignal(bool)
+    idle_changed = pyqtSignal(bool)
+
+    SCREENSAVERS = (
+        ("org.freedesktop.ScreenSaver", "/org/freedesktop/ScreenSaver", "org.freedesktop.ScreenSaver"),
+        ("org.gnome.ScreenSaver", "/org/gnome/ScreenSaver", "org.gnome.ScreenSaver"),
+    )
+
+    def __init__(self, idle_seconds=DEFAULT_IDLE_PAUSE_SECONDS, parent=None):
+        super().__init__(parent)
+        self.idle_seconds = idle_seconds
+        self.idle = False
+        self.source = None
+        if QDBusConnection is not None:
+            session = QDBusConnection.sessionBus()
+            if session.isConnected():
+                for service, path, interface in self.SCREENSAVERS:
+                    if session.connect(service, path, interface, "ActiveChanged", self.on_screensaver_active):
+                        self.source = "dbus"
+            system = QDBusConnection.systemBus()
+            # Only our own session: other sessions on the seat lock and
+            # unlock independently of the one showing our wallpapers.
+            session_path = self.login_session_path(system) if system.isConnected() else None
+            if session_path:
+                system.connect("org.freedesktop.login1", session_path, "org.freedesktop.login1.Session",
+                               "Lock", self.on_lock)
+                system.connect("org.freedesktop.login1", session_path, "org.freedesktop.login1.Session",
+                               "Unlock", self.on_unlock)
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(IDLE_POLL_INTERVAL)
+        self.idle_timer.timeout.connect(self.poll_idle)
+        if self.source is None and idle_seconds > 0 and shutil.which("xprintidle"):
+            self.source = "xprintidle"
+            self.idle_timer.start()
+        logging.info("Session idle detection: %s", self.source or "unavailable")
+
+    @staticmethod
+    def login_session_path(system):
+        """Return the logind object path of the session we run in, or None."""
+        manager = QDBusInterface("org.freedesktop.login1", "/org/freedesktop/login1",
+                                 "org.freedesktop.login1.Manager", system)
+        session_id = os.getenv("XDG_SESSION_ID")
+        if session_id:
+            reply = manager.call("GetSession", session_id)
+        else:
+            reply = manager.call("GetSessionByPID", QDBusArgument(os.getpid(), QMetaType.Type.UInt.value))
+        if reply.type() != QDBusMessage.MessageType.ReplyMessage or not reply.arguments():
+            logging.info("No logind session found, ignoring session locks: %s", reply.errorMessage())
+            return None
+        path = reply.arguments()[0]
+        return path.path() if isinstance(path, QDBusObjectPath) else str(path)
+
+    @pyqtSlot(bool)
+    def on_screensaver_active(self, active):
+        self.set_idle(active)
+
+    @pyqtSlot()
+    def on_lock(self):
+        self.locked_changed.emit(True)
+
+    @pyqtSlot()
+    def on_unlock(self):
+        self.locked_changed.emit(False)
+
+    def set_idle(self, idle):
+        if idle != self.idle:
+            self.idle = idle
+            self.idle_changed.emit(idle)
+
+    def poll_idle(self):
         try:
-            self.observer.start()
+            res = subprocess.run(["xprintidle"], capture_output=True, text=True, timeout=1)
+            self.set_idle(int(res.stdout.strip()) >= self.idle_seconds * 1000)
         except Exception as e:
-            print(f"Failed to start observer: {e}")
+            logging.info("xprintidle failed, stopping idle polling: %s", e)
+            self.idle_timer.stop()
 
-    def stop(self):
-        if self.observer.is_alive():
-            self.observer.stop()
-            self.observer.join()
+class ExitWatcher(QObject):
+    """Signals backend exits as they happen by watching a pidfd per process.
+
+    watch() returns False where pidfds are not available (Linux < 5.3), in
+    which case exits have to be found by polling.
+    """
+    exited = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watched = {}
+
+    def watch(self, proc):
+        try:
+            fd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError) as e:
+            logging.info("pidfd not available, polling for backend exits: %s", e)
+            return False
+        notifier = QSocketNotifier(fd, QSocketNotifier.Type.Read, self)
+        notifier.activated.connect(lambda *args, pid=proc.pid: self.on_exited(pid))
+        self.watched[proc.pid] = (notifier, fd)
+        return True
+
+    def on_exited(self, pid):
+        notifier, fd = self.watched.pop(pid, (None, None))
+        if notifier is None:
+            return
+        notifier.setEnabled(False)
+        notifier.deleteLater()
+        os.close(fd)
+        self.exited.emit(pid)
+
+ASYNC_STEP_MS = 5
+
+class QtAsyncLoop(QObject):
+    """Steps an asyncio event loop from the Qt event loop while it has tasks.
+
+    Coroutines run on the GUI thread, so they can share the process
+    manager with the rest of the window without locking. Completion
+    callbacks are delivered from the Qt event loop, outside the step.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.loop = asyncio.new_event_loop()
+        self.timer = QTimer(self)
+        self.timer.setInterval(ASYNC_STEP_MS)
+        self.timer.timeout.connect(self.step)
+
+    def submit(self, coro, on_done=None):
+        task = self.loop.create_task(self._run(coro, on_done))
+        self.timer.start()
+        return task
+
+    async def _run(self, coro, on_done):
+        # Done callbacks would only run on a later step, after the timer
+        # may have stopped, so completion is reported from the task itself.
+        task = asyncio.current_task()
+        try:
+            return await coro
+        finally:
+            if on_done is not None:
+                QTimer.singleShot(0, lambda: on_done(task))
+
+    def step(self):
+        # Runs everything that is ready and polls I/O once, without blocking
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        if not asyncio.all_tasks(self.loop):
+            self.timer.stop()
+
+    def close(self):
+        """Cancel the tasks still running and close the loop."""
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+# Changes to launch options within this window are applied as one launch
+LAUNCH_COALESCE_MS = 300
+
+def build_backend_command(options):
+    """Return the backend command line for a launch_options() snapshot.
+
+    Pure function of its input, so two snapshots that would start the same
+    backend produce equal commands.
+    """
+    cmd = ['linux-wallpaperengine']
+    if options["window"]:
+        cmd.extend(['--window', options["window"]])
+    else:
+        cmd.extend(['--screen-root', options["screen"]])
+    cmd.extend(['--bg', options["background"]])
+    if options["silent"]: cmd.append('--silent')
+    elif options["volume"] != 15: cmd.extend(['--volume', str(options["volume"])])
+    if options["noautomute"]: cmd.append('--noautomute')
+    if options["no_audio_processing"]: cmd.append('--no-audio-processing')
+    if options["fps"] != 30: cmd.extend(['--fps', str(options["fps"])])
+    if options["disable_mouse"]: cmd.append('--disable-mouse')
+    if options["disable_parallax"]: cmd.append('--disable-parallax')
+    if options["no_fullscreen_pause"]: cmd.append('--no-fullscreen-pause')
+    if options["scaling"] != 'default': cmd.extend(['--scaling', options["scaling"]])
+    if options["clamp"] != 'clamp': cmd.extend(['--clamp', options["clamp"]])
+    for name, sep, value in options["properties"]:
+        cmd.extend(['--set-property', f"{name}{sep}{value}"])
+    cmd.extend(options["custom_args"].split())
+    return cmd
 
 class WallpaperApp(QMainWindow):
     def __init__(self):
@@ -219,6 +1064,15 @@ class WallpaperApp(QMainWindow):
         self.i18n = I18n()
         self.translatable_labels = []
         self.properties_data = {}
+        self.properties_listed_for = None
+        self.properties_streaming_for = None
+        self.restoring_screens = False
+        self.property_cache = PropertyCache()
+        self.property_cache.load()
+        self.property_prefetcher = PropertyPrefetcher(self.property_cache, self)
+        self.property_prefetcher.listing_ready.connect(self.on_property_listing_ready)
+        self.launch_history = LaunchHistory()
+        self.launch_history.load()
         self.load_config_data()
         self.i18n.load(self.config.get("current_language", "en"))
         self._ = self.i18n.get
@@ -234,21 +1088,135 @@ class WallpaperApp(QMainWindow):
         self.update_texts()
 
         # Setup file watcher for auto-refresh
-        self.watcher = LibraryWatcher()
-        self.watcher.library_changed.connect(self.on_library_changed_auto)
+        self.watcher = LibraryWatcher(self.config.get("watch_budget", DEFAULT_WATCH_BUDGET))
+        self.watcher.items_changed.connect(self.on_library_changed_auto)
+        self.watcher.strategy_changed.connect(self.update_watch_status)
+        self.pending_refresh = set()
+
+        # Fill the library from the on-disk index before any scan runs
+        self.thumbnail_cache = ThumbnailCache()
+        self.thumbnail_cache.open()
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnail_cache, self)
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.library_index = LibraryIndex()
+        self.load_library_index()
 
         QTimer.singleShot(500, self.restore_last_wallpaper)
 
-        self.wallpaper_proc_manager = WallpaperProcessManager()
+        # Backend exits are picked up through pidfds; the poll timer only
+        # runs where those are not available.
+        self.exit_watcher = ExitWatcher(self)
+        self.exit_watcher.exited.connect(self.check_wallpaper_process)
         self.wallpaper_watchdog = QTimer()
         self.wallpaper_watchdog.setInterval(1000)
         self.wallpaper_watchdog.timeout.connect(self.check_wallpaper_process)
-        self.wallpaper_watchdog.start()
-
-    def on_library_changed_auto(self):
-        # Trigger a scan if one isn't already running
-        if self.btn_scan.isEnabled():
-            self.start_scan()
+        self.pending_restarts = {}
+        # Starts and stops run as coroutines so waiting for a backend to
+        # exit never blocks the window; queries go through the sync facade.
+        self.async_loop = QtAsyncLoop(self)
+        self.wallpaper_proc_manager = WallpaperProcessManager(on_spawn=self.watch_backend,
+                                                              submit=self.async_loop.submit)
+        self.scope_probe = None
+        self.apply_limit_profile()
+        self.launch_timer = QTimer(self)
+        self.launch_timer.setSingleShot(True)
+        self.launch_timer.setInterval(LAUNCH_COALESCE_MS)
+        self.launch_timer.timeout.connect(self.run_wallpaper)
+        # Polls freshly started backends until they are ready to take over
+        self.handoff_timer = QTimer(self)
+        self.handoff_timer.setInterval(50)
+        self.handoff_timer.timeout.connect(self.check_wallpaper_ready)
+
+        # Runs from the first backend spawn until no backend is left
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(int(SAMPLE_INTERVAL * 1000))
+        self.stats_timer.timeout.connect(self.sample_resources)
+
+        self.fps_governor = FpsGovernor(
+            self.config.get("fps_tiers"),
+            sysfs_root=self.config.get("governor_sysfs_root", SYSFS_ROOT),
+            proc_root=self.config.get("governor_proc_root", PROC_ROOT))
+        self.governor_timer = QTimer(self)
+        self.governor_timer.setInterval(int(GOVERNOR_INTERVAL * 1000))
+        self.governor_timer.timeout.connect(self.run_fps_governor)
+        if self.chk_fps_governor.isChecked():
+            self.governor_timer.start()
+
+        # Backends are suspended while any of these reasons apply
+        self.pause_reasons = set()
+        self.session_monitor = SessionMonitor(
+            self.config.get("pause_when_idle_seconds", DEFAULT_IDLE_PAUSE_SECONDS), self)
+        if self.config.get("pause_on_lock", True):
+            self.session_monitor.locked_changed.connect(lambda on: self.set_pause_reason("locked", on))
+            self.session_monitor.idle_changed.connect(lambda on: self.set_pause_reason("idle", on))
+
+    def load_library_index(self):
+        if not self.library_index.load():
+            return
+        self.wallpaper_model.set_wallpapers(self.library_index.wallpapers())
+        self.update_library_watches(self.library_index.roots)
+        self.filter_wallpapers(self.search_input.text())
+
+    def update_library_watches(self, roots=None):
+        if roots is None:
+            roots = self.watcher.roots
+        self.watcher.update_watches(roots, [w["path"] for w in self.wallpaper_model.wallpapers])
+
+    def update_watch_status(self):
+        w = self.watcher
+        if w.inotify_error is not None:
+            text = self._("watch_status_unavailable").format(
+                items=len(w.items), seconds=WATCH_POLL_INTERVAL // 1000, error=w.inotify_error)
+        elif w.strategy == WATCH_POLL:
+            text = self._("watch_status_poll").format(
+                count=w.watch_count(), items=len(w.items),
+                seconds=WATCH_POLL_INTERVAL // 1000, budget=w.budget)
+        else:
+            text = self._("watch_status_inotify").format(count=w.watch_count())
+        self.lbl_watch_status.setText(text)
+
+    def on_library_changed_auto(self, item_dirs):
+        self.pending_refresh |= item_dirs
+        # A running scan or refresh picks the pending items up when it ends
+        if self.btn_scan.isEnabled() and not self.refresh_running():
+            self.start_refresh()
+
+    def refresh_running(self):
+        return getattr(self, "refresh_worker", None) is not None
+
+    def start_refresh(self):
+        item_dirs, self.pending_refresh = self.pending_refresh, set()
+        self.refresh_thread = QThread()
+        self.refresh_worker = Worker(self.refresh_logic, item_dirs)
+        self.refresh_worker.moveToThread(self.refresh_thread)
+        self.refresh_thread.started.connect(self.refresh_worker.run)
+        self.refresh_worker.finished.connect(self.refresh_finished)
+        self.refresh_worker.finished.connect(self.refresh_thread.quit)
+        self.refresh_worker.finished.connect(self.refresh_worker.deleteLater)
+        self.refresh_thread.finished.connect(self.refresh_thread.deleteLater)
+        self.refresh_thread.start()
+
+    def refresh_logic(self, item_dirs):
+        updated = []
+        removed = set()
+        for item_dir in item_dirs:
+            w = self.library_index.read_item(item_dir, os.path.basename(item_dir))
+            if w:
+                updated.append(w)
+            else:
+                removed.add(item_dir)
+        self.library_index.save()
+        return updated, removed
+
+    def refresh_finished(self, result):
+        updated, removed = result
+        self.refresh_worker = None
+        self.wallpaper_model.apply_changes(updated, removed)
+        self.filter_wallpapers(self.search_input.text())
+        self.update_library_watches()
+        logging.info("Library refresh: %d updated, %d removed", len(updated), len(removed))
+        if self.pending_refresh and self.btn_scan.isEnabled():
+            self.start_refresh()
 
     def setup_ui(self):
         main_widget = QWidget()
@@ -300,6 +1268,7 @@ class WallpaperApp(QMainWindow):
         self.wp_id_input.textChanged.connect(self.on_wallpaper_id_changed)
         self.screen_combo = QComboBox()
         self.screen_combo.setEditable(True)
+        self.screen_combo.currentTextChanged.connect(self.on_screen_changed)
         self.add_form_row(card_main, "wallpaper_id_path_label", self.wp_id_input)
         self.add_form_row(card_main, "screen_label", self.screen_combo)
         h_layout = QHBoxLayout()
@@ -307,15 +1276,15 @@ class WallpaperApp(QMainWindow):
         layout.addLayout(h_layout)
         card_audio = self.create_card(h_layout, "audio_frame")
         self.chk_silent = QCheckBox("silent_checkbox")
-        self.chk_silent.clicked.connect(self.run_wallpaper)
+        self.chk_silent.clicked.connect(self.schedule_launch)
         self.slider_volume = QSlider(Qt.Orientation.Horizontal)
         self.slider_volume.setRange(0, 100)
         self.slider_volume.setValue(15)
-        self.slider_volume.sliderReleased.connect(self.run_wallpaper)
+        self.slider_volume.sliderReleased.connect(self.schedule_launch)
         self.chk_no_automute = QCheckBox("no_automute_checkbox")
-        self.chk_no_automute.clicked.connect(self.run_wallpaper)
+        self.chk_no_automute.clicked.connect(self.schedule_launch)
         self.chk_no_proc = QCheckBox("no_audio_processing_checkbox")
-        self.chk_no_proc.clicked.connect(self.run_wallpaper)
+        self.chk_no_proc.clicked.connect(self.schedule_launch)
         l = card_audio.layout()
         l.addWidget(self.chk_silent)
         l.addWidget(self.create_label("volume_label"))
@@ -326,32 +1295,45 @@ class WallpaperApp(QMainWindow):
         self.slider_fps = QSlider(Qt.Orientation.Horizontal)
         self.slider_fps.setRange(10, 144)
         self.slider_fps.setValue(30)
-        self.slider_fps.sliderReleased.connect(self.run_wallpaper)
+        self.slider_fps.sliderReleased.connect(self.schedule_launch)
         self.chk_mouse = QCheckBox("disable_mouse_checkbox")
-        self.chk_mouse.clicked.connect(self.run_wallpaper)
+        self.chk_mouse.clicked.connect(self.schedule_launch)
         self.chk_parallax = QCheckBox("disable_parallax_checkbox")
-        self.chk_parallax.clicked.connect(self.run_wallpaper)
+        self.chk_parallax.clicked.connect(self.schedule_launch)
         self.chk_fs_pause = QCheckBox("no_fullscreen_pause_checkbox")
-        self.chk_fs_pause.clicked.connect(self.run_wallpaper)
+        self.chk_fs_pause.clicked.connect(self.schedule_launch)
+        self.chk_fps_governor = QCheckBox("fps_governor_checkbox")
+        self.chk_fps_governor.setChecked(self.config.get("fps_governor", False))
+        self.chk_fps_governor.toggled.connect(self.on_fps_governor_toggled)
         l = card_perf.layout()
         l.addWidget(self.create_label("fps_label"))
         l.addWidget(self.slider_fps)
         l.addWidget(self.chk_mouse)
         l.addWidget(self.chk_parallax)
         l.addWidget(self.chk_fs_pause)
+        l.addWidget(self.chk_fps_governor)
         card_adv = self.create_card(layout, "adv_frame")
         self.combo_scaling = QComboBox()
         self.combo_scaling.addItems(['default', 'stretch', 'fit', 'fill'])
         if "scale" in self.config:
             self.combo_scaling.setCurrentText(self.config["scale"])
-        self.combo_scaling.currentTextChanged.connect(self.run_wallpaper)
+        self.combo_scaling.currentTextChanged.connect(self.schedule_launch)
         self.combo_clamp = QComboBox()
         self.combo_clamp.addItems(['clamp', 'border', 'repeat'])
         if "clamp" in self.config:
             self.combo_clamp.setCurrentText(self.config["clamp"])
-        self.combo_clamp.currentTextChanged.connect(self.run_wallpaper)
+        self.combo_clamp.currentTextChanged.connect(self.schedule_launch)
         self.chk_windowed_mode = QCheckBox("windowed_mode_checkbox")
-        self.chk_windowed_mode.clicked.connect(self.run_wallpaper)
+        self.chk_windowed_mode.clicked.connect(self.schedule_launch)
+        self.chk_handoff = QCheckBox("handoff_checkbox")
+        self.chk_handoff.setChecked(self.config.get("handoff_launch", True))
+        self.chk_handoff.toggled.connect(self.on_handoff_toggled)
+        self.combo_limits = QComboBox()
+        for name in self.limit_profiles():
+            self.combo_limits.addItem(name, name)
+        index = self.combo_limits.findData(self.config.get("limit_profile", "none"))
+        self.combo_limits.setCurrentIndex(max(index, 0))
+        self.combo_limits.currentIndexChanged.connect(self.on_limit_profile_changed)
         self.input_custom_args = QLineEdit()
         self.input_custom_args.setPlaceholderText("--window 0x0x1280x720")
 
@@ -361,7 +1343,9 @@ class WallpaperApp(QMainWindow):
         self.add_form_row(card_adv, "language_label", self.combo_lang)
         self.add_form_row(card_adv, "scaling_label", self.combo_scaling)
         self.add_form_row(card_adv, "clamp_label", self.combo_clamp)
+        self.add_form_row(card_adv, "limits_label", self.combo_limits)
         card_adv.layout().addWidget(self.chk_windowed_mode)
+        card_adv.layout().addWidget(self.chk_handoff)
 
         self.lbl_kwin_hint = QLabel("kwin_hint")
         self.lbl_kwin_hint.setWordWrap(True)
@@ -413,7 +1397,7 @@ class WallpaperApp(QMainWindow):
         btn_layout.setSpacing(12)
         layout.addLayout(btn_layout)
         self.btn_set = QPushButton("set_wallpaper_button")
-        self.btn_set.clicked.connect(self.run_wallpaper)
+        self.btn_set.clicked.connect(self.apply_wallpaper)
         self.btn_set.setCursor(Qt.CursorShape.PointingHandCursor)
         self.btn_set.setMinimumHeight(32)
         self.btn_show_log = QPushButton("show_log_button")
@@ -421,6 +1405,16 @@ class WallpaperApp(QMainWindow):
         self.btn_show_log.clicked.connect(self.show_log_file)
         self.btn_show_log.setCursor(Qt.CursorShape.PointingHandCursor)
         self.btn_show_log.setMinimumHeight(32)
+        self.btn_restart_screen = QPushButton("restart_screen_button")
+        self.btn_restart_screen.setObjectName("SecondaryButton")
+        self.btn_restart_screen.clicked.connect(self.restart_screen)
+        self.btn_restart_screen.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_restart_screen.setMinimumHeight(32)
+        self.btn_export_launches = QPushButton("export_launches_button")
+        self.btn_export_launches.setObjectName("SecondaryButton")
+        self.btn_export_launches.clicked.connect(self.export_launch_history)
+        self.btn_export_launches.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_export_launches.setMinimumHeight(32)
         self.btn_stop = QPushButton("stop_button")
         self.btn_stop.setObjectName("DangerButton")
         self.btn_stop.clicked.connect(self.stop_wallpapers)
@@ -428,7 +1422,18 @@ class WallpaperApp(QMainWindow):
         self.btn_stop.setMinimumHeight(32)
         btn_layout.addWidget(self.btn_set)
         btn_layout.addWidget(self.btn_show_log)
+        btn_layout.addWidget(self.btn_restart_screen)
+        btn_layout.addWidget(self.btn_export_launches)
         btn_layout.addWidget(self.btn_stop)
+        self.lbl_screen_status = QLabel()
+        self.lbl_screen_status.setStyleSheet("color: #888; font-size: 11px;")
+        layout.addWidget(self.lbl_screen_status)
+        self.lbl_resource_stats = QLabel()
+        self.lbl_resource_stats.setStyleSheet("color: #888; font-size: 11px;")
+        layout.addWidget(self.lbl_resource_stats)
+        self.lbl_launch_stats = QLabel()
+        self.lbl_launch_stats.setStyleSheet("color: #888; font-size: 11px;")
+        layout.addWidget(self.lbl_launch_stats)
         layout.addStretch()
 
     def setup_library_page(self):
@@ -449,7 +1454,7 @@ class WallpaperApp(QMainWindow):
         self.btn_select_folder.setCursor(Qt.CursorShape.PointingHandCursor)
         header.addWidget(self.btn_select_folder)
         self.btn_set_library = QPushButton("set_wallpaper_button")
-        self.btn_set_library.clicked.connect(self.run_wallpaper)
+        self.btn_set_library.clicked.connect(self.apply_wallpaper)
         self.btn_set_library.setMinimumHeight(36)
         self.btn_set_library.setObjectName("PrimaryButton")
         self.btn_set_library.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -460,21 +1465,51 @@ class WallpaperApp(QMainWindow):
         self.search_input.setPlaceholderText(self._("search_placeholder"))
         self.search_input.textChanged.connect(self.filter_wallpapers)
         search_layout.addWidget(self.search_input)
+        self.facet_combos = {}
+        for facet in FACETS:
+            combo = QComboBox()
+            combo.setMinimumWidth(140)
+            combo.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToContents)
+            combo.currentIndexChanged.connect(self.on_facet_changed)
+            search_layout.addWidget(combo)
+            self.facet_combos[facet] = combo
         layout.addLayout(search_layout)
-        self.list_wallpapers = QListWidget()
+        self.lbl_watch_status = QLabel()
+        self.lbl_watch_status.setStyleSheet("color: #888; font-size: 11px;")
+        layout.addWidget(self.lbl_watch_status)
+        placeholder = QPixmap(THUMB_WIDTH, THUMB_HEIGHT)
+        placeholder.fill(QColor("#3A3A3A"))
+        self.wallpaper_model = WallpaperModel(QIcon(placeholder), self)
+        self.wallpaper_model.search_index_ready.connect(self.on_search_index_ready)
+        self.wallpaper_filter = WallpaperFilterModel(self)
+        self.wallpaper_filter.setSourceModel(self.wallpaper_model)
+        self.list_wallpapers = QListView()
         self.list_wallpapers.setObjectName("WallpaperGrid")
-        self.list_wallpapers.setViewMode(QListWidget.ViewMode.IconMode)
-        self.list_wallpapers.setResizeMode(QListWidget.ResizeMode.Adjust)
+        self.list_wallpapers.setModel(self.wallpaper_filter)
+        self.list_wallpapers.setViewMode(QListView.ViewMode.IconMode)
+        self.list_wallpapers.setResizeMode(QListView.ResizeMode.Adjust)
+        self.list_wallpapers.setMovement(QListView.Movement.Static)
+        self.list_wallpapers.setUniformItemSizes(True)
+        self.list_wallpapers.setLayoutMode(QListView.LayoutMode.Batched)
+        self.list_wallpapers.setBatchSize(500)
         self.list_wallpapers.setGridSize(QSize(250, 200))
         self.list_wallpapers.setSpacing(10)
         self.list_wallpapers.setWordWrap(True)
-        self.list_wallpapers.setIconSize(QSize(200, 140))
+        self.list_wallpapers.setIconSize(QSize(THUMB_WIDTH, THUMB_HEIGHT))
         self.list_wallpapers.setItemDelegate(WallpaperDelegate(self.list_wallpapers))
         self.list_wallpapers.setMouseTracking(True)
-        self.list_wallpapers.itemClicked.connect(self.on_wallpaper_selected)
-        self.list_wallpapers.itemDoubleClicked.connect(self.run_wallpaper)
+        self.list_wallpapers.clicked.connect(self.on_wallpaper_selected)
+        self.list_wallpapers.entered.connect(self.on_wallpaper_hovered)
+        self.list_wallpapers.doubleClicked.connect(self.apply_wallpaper)
         layout.addWidget(self.list_wallpapers)
 
+        self.thumb_timer = QTimer()
+        self.thumb_timer.setSingleShot(True)
+        self.thumb_timer.setInterval(50)
+        self.thumb_timer.timeout.connect(self.update_visible_thumbnails)
+        self.list_wallpapers.verticalScrollBar().valueChanged.connect(self.schedule_thumbnail_update)
+        self.list_wallpapers.verticalScrollBar().rangeChanged.connect(self.schedule_thumbnail_update)
+
     def create_label(self, text_key):
         lbl = QLabel(self._(text_key))
         self.translatable_labels.append((lbl, text_key))
@@ -519,6 +1554,9 @@ class WallpaperApp(QMainWindow):
         self.btn_set.setText(self._("set_wallpaper_button"))
         self.btn_set_library.setText(self._("set_wallpaper_button"))
         self.btn_stop.setText(self._("stop_button"))
+        self.btn_restart_screen.setText(self._("restart_screen_button"))
+        self.btn_export_launches.setText(self._("export_launches_button"))
+        self.update_launch_stats()
         self.btn_show_log.setText(self._("show_log_button"))
         self.btn_scan.setText(self._("scan_local_wallpapers_button"))
         self.btn_select_folder.setText(self._("select_folder_button"))
@@ -528,16 +1566,29 @@ class WallpaperApp(QMainWindow):
         self.chk_mouse.setText(self._("disable_mouse_checkbox"))
         self.chk_parallax.setText(self._("disable_parallax_checkbox"))
         self.chk_fs_pause.setText(self._("no_fullscreen_pause_checkbox"))
+        self.chk_fps_governor.setText(self._("fps_governor_checkbox"))
         self.chk_windowed_mode.setText(self._("windowed_mode_checkbox"))
+        self.chk_handoff.setText(self._("handoff_checkbox"))
+        for i in range(self.combo_limits.count()):
+            name = self.combo_limits.itemData(i)
+            if name in DEFAULT_PROFILES:
+                self.combo_limits.setItemText(i, self._(f"limits_profile_{name}"))
         self.lbl_kwin_hint.setText(self._("kwin_hint"))
         self.btn_load_props.setText(self._("load_properties_button"))
         self.btn_apply_prop.setText(self._("apply_property_button"))
         self.properties_combo.setItemText(0, self._("properties_select_placeholder"))
         self.properties_value.setPlaceholderText(self._("property_value_placeholder"))
         self.search_input.setPlaceholderText(self._("search_placeholder"))
+        self.update_facet_combos()
+        if hasattr(self, "watcher"):
+            self.update_watch_status()
 
     def switch_page(self, row):
         self.stack.setCurrentIndex(row)
+        if self.stack.currentWidget() is self.page_library:
+            self.schedule_thumbnail_update()
+        elif self.stack.currentWidget() is self.page_control:
+            self.show_cached_properties()
 
     def change_lang(self, text):
         code = self.combo_lang.currentData()
@@ -547,35 +1598,32 @@ class WallpaperApp(QMainWindow):
             self.save_config()
 
     def start_scan(self):
+        self.run_scan()
+
+    def manual_scan(self):
+        directory = QFileDialog.getExistingDirectory(self, self._("select_folder_button"))
+        if directory:
+            self.run_scan(manual_dir=directory)
+
+    def run_scan(self, manual_dir=None):
         self.status_bar.showMessage(self._("status_searching_local"))
         self.btn_scan.setEnabled(False)
         self.search_input.clear()
+        self.scan_found = 0
+        self.scan_rows_before = self.wallpaper_model.rowCount()
         self.thread = QThread()
-        self.worker = Worker(self.scan_logic)
+        self.worker = Worker(self.scan_logic, manual_dir=manual_dir)
+        # Batches are emitted from the worker thread and queued to the GUI
+        self.worker.kwargs["on_batch"] = self.worker.progress.emit
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.scan_batch)
         self.worker.finished.connect(self.scan_finished)
         self.worker.finished.connect(self.thread.quit)
         self.worker.finished.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         self.thread.start()
 
-    def manual_scan(self):
-        directory = QFileDialog.getExistingDirectory(self, self._("select_folder_button"))
-        if directory:
-            self.status_bar.showMessage(self._("status_searching_local"))
-            self.btn_scan.setEnabled(False)
-            self.search_input.clear()
-            self.thread = QThread()
-            self.worker = Worker(self.scan_logic, manual_dir=directory)
-            self.worker.moveToThread(self.thread)
-            self.thread.started.connect(self.worker.run)
-            self.worker.finished.connect(self.scan_finished)
-            self.worker.finished.connect(self.thread.quit)
-            self.worker.finished.connect(self.worker.deleteLater)
-            self.thread.finished.connect(self.thread.deleteLater)
-            self.thread.start()
-
     def get_steam_workshop_dirs(self):
         workshop_dirs = set()
         base_paths = [
@@ -641,105 +1689,162 @@ class WallpaperApp(QMainWindow):
 
         return workshop_dirs
 
-    def scan_logic(self, manual_dir=None):
+    def scan_logic(self, manual_dir=None, on_batch=None):
         workshop_dirs = self.get_steam_workshop_dirs()
         is_append = manual_dir is not None
         if manual_dir:
             workshop_dirs.add(manual_dir)
 
-        wallpapers = []
-        seen = set()
-
-        for w_dir in workshop_dirs:
-            try:
-                proj_self = os.path.join(w_dir, "project.json")
-                if os.path.isfile(proj_self):
-                    try:
-                        with open(proj_self, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            item_id = os.path.basename(w_dir)
-                            wallpapers.append({
-                                "title": data.get("title", "Untitled"),
-                                "id": item_id,
-                                "path": w_dir,
-                                "preview": data.get("preview")
-                            })
-                            seen.add(item_id)
-                    except: pass
-                for item_id in os.listdir(w_dir):
-                    if item_id in seen: continue
-                    path = os.path.join(w_dir, item_id)
-                    proj = os.path.join(path, "project.json")
-                    if os.path.isfile(proj):
-                        try:
-                            with open(proj, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-                                wallpapers.append({
-                                    "title": data.get("title", "Untitled"),
-                                    "id": item_id,
-                                    "path": path,
-                                    "preview": data.get("preview")
-                                })
-                                seen.add(item_id)
-                        except: pass
-            except: pass
-
-        return wallpapers, is_append, list(workshop_dirs)
-
-    def scan_finished(self, result):
-        wallpapers, is_append, scanned_dirs = result
-        if hasattr(self, 'watcher'):
-            self.watcher.update_watches(scanned_dirs)
+        index = self.library_index
+        index.reset_stats()
+        budget = self.config.get("scan_root_budget", DEFAULT_ROOT_BUDGET)
+        wallpapers, statuses, seen_paths = scan_roots(index, sorted(workshop_dirs), budget, on_batch)
 
+        incomplete = [root for root, status in statuses.items() if status != ROOT_OK]
         if not is_append:
-            self.list_wallpapers.clear()
-        existing_ids = set()
-        for i in range(self.list_wallpapers.count()):
-            data = self.list_wallpapers.item(i).data(Qt.ItemDataRole.UserRole)
-            if data: existing_ids.add(data["id"])
-        new_count = 0
-        wallpapers.sort(key=lambda x: x["title"].lower())
-        for w in wallpapers:
-            if w["id"] in existing_ids: continue
-            item = QListWidgetItem(w["title"])
-            item.setData(Qt.ItemDataRole.UserRole, w)
-
+            index.prune(seen_paths, keep_roots=incomplete)
+            index.set_roots(workshop_dirs)
+        index.save()
+        logging.info("Library scan: %d cached, %d re-parsed", index.hits, index.misses)
 
-            if w.get("preview"):
-                path = os.path.join(w["path"], w["preview"])
-                if os.path.isfile(path):
-                    pixmap = QPixmap(path)
+        return wallpapers, is_append, list(workshop_dirs), statuses
 
-                    icon_pixmap = pixmap.scaled(200, 140, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+    def scan_batch(self, wallpapers):
+        self.scan_found += len(wallpapers)
+        self.wallpaper_model.merge_wallpapers(wallpapers)
+        self.schedule_thumbnail_update()
+        self.status_bar.showMessage(self._("status_scan_progress").format(count=self.scan_found))
 
+    def scan_finished(self, result):
+        wallpapers, is_append, scanned_dirs, statuses = result
+        incomplete = sorted(root for root, status in statuses.items() if status != ROOT_OK)
+        for root in incomplete:
+            logging.warning("Library folder %s was not fully scanned (%s)", root, statuses[root])
 
-                    rect = QRect(0, 0, 200, 140)
-                    rect.moveCenter(icon_pixmap.rect().center())
-                    icon_pixmap = icon_pixmap.copy(rect)
-
-                    item.setIcon(QIcon(icon_pixmap))
-
-            self.list_wallpapers.addItem(item)
-            existing_ids.add(w["id"])
-            new_count += 1
+        if is_append:
+            self.wallpaper_model.merge_wallpapers(wallpapers)
+            new_count = self.wallpaper_model.rowCount() - self.scan_rows_before
+        else:
+            # Items under roots that timed out are kept rather than dropped
+            self.wallpaper_model.sync_wallpapers(
+                wallpapers, keep=lambda w: path_in_roots(w["path"], incomplete))
+        self.filter_wallpapers(self.search_input.text())
+        self.update_library_watches(scanned_dirs)
         self.btn_scan.setEnabled(True)
+        if self.pending_refresh and not self.refresh_running():
+            self.start_refresh()
         if is_append:
-            self.status_bar.showMessage(f"Added {new_count} new wallpapers.")
+            msg = f"Added {new_count} new wallpapers."
         else:
-            self.status_bar.showMessage(self._("status_local_wallpapers_found").format(count=self.list_wallpapers.count()))
+            msg = self._("status_local_wallpapers_found").format(count=self.wallpaper_model.rowCount())
+        if incomplete:
+            msg = f"{msg} {self._('status_scan_incomplete').format(roots=', '.join(incomplete))}"
+        self.status_bar.showMessage(msg)
 
-    def on_wallpaper_selected(self, item):
-        data = item.data(Qt.ItemDataRole.UserRole)
+    def schedule_thumbnail_update(self):
+        self.thumb_timer.start()
+
+    def visible_wallpaper_rows(self, margin):
+        view = self.list_wallpapers
+        proxy = self.wallpaper_filter
+        count = proxy.rowCount()
+        top = -margin
+        bottom = view.viewport().height() + margin
+
+        # Rows are laid out in reading order, so the first visible one can be
+        # found by bisection instead of asking Qt for every item's geometry.
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if view.visualRect(proxy.index(mid, 0)).bottom() >= top:
+                hi = mid
+            else:
+                lo = mid + 1
+        rows = []
+        for row in range(lo, count):
+            if view.visualRect(proxy.index(row, 0)).top() > bottom:
+                break
+            rows.append(proxy.mapToSource(proxy.index(row, 0)).row())
+        return rows
+
+    def update_visible_thumbnails(self):
+        margin = self.list_wallpapers.gridSize().height()
+        model = self.wallpaper_model
+        wanted = set()
+        for row in self.visible_wallpaper_rows(margin):
+            data = model.wallpaper_at(row)
+            if not data.get("preview") or data["id"] in model.thumbnails:
+                continue
+            path = os.path.join(data["path"], data["preview"])
+            image = self.thumbnail_loader.cached(path)
+            if image is not None:
+                self.on_thumbnail_ready(data["id"], image)
+                continue
+            wanted.add(data["id"])
+            self.thumbnail_loader.request(data["id"], path)
+        # Anything queued for rows that scrolled out of view is dropped
+        self.thumbnail_loader.cancel_except(wanted)
+
+    def on_thumbnail_ready(self, wp_id, image):
+        self.wallpaper_model.set_thumbnail(wp_id, QIcon(QPixmap.fromImage(image)))
+
+    def on_wallpaper_selected(self, index):
+        data = index.data(Qt.ItemDataRole.UserRole)
+        self.property_prefetcher.prefetch(data["id"], data["path"])
         self.wp_id_input.setText(data["id"])
 
+    def on_wallpaper_hovered(self, index):
+        data = index.data(Qt.ItemDataRole.UserRole)
+        if data:
+            self.property_prefetcher.prefetch(data["id"], data["path"])
+
+    def selected_facets(self):
+        selection = {}
+        for facet, combo in self.facet_combos.items():
+            code = combo.currentData()
+            selection[facet] = set() if code is None else {code}
+        return selection
+
     def filter_wallpapers(self, text):
-        query = text.lower()
-        for i in range(self.list_wallpapers.count()):
-            item = self.list_wallpapers.item(i)
-            data = item.data(Qt.ItemDataRole.UserRole)
-            title = item.text().lower()
-            wp_id = str(data.get("id", "")).lower()
-            item.setHidden(query not in title and query not in wp_id)
+        scores, self.facet_counts = self.wallpaper_model.filter(text, self.selected_facets())
+        self.wallpaper_filter.set_scores(scores, rank=bool(text.strip()))
+        self.update_facet_combos()
+        self.schedule_thumbnail_update()
+
+    def on_facet_changed(self):
+        self.filter_wallpapers(self.search_input.text())
+
+    def update_facet_combos(self):
+        """Refill the facet combos with live counts, keeping the selection.
+
+        Values without matches are hidden unless selected; the rest are
+        listed by count.
+        """
+        counts = getattr(self, "facet_counts", None)
+        if counts is None:
+            return
+        columns = self.wallpaper_model.metadata.columns
+        for facet, combo in self.facet_combos.items():
+            total, per_code = counts[facet]
+            labels = columns[facet].labels
+            current = combo.currentData()
+            if current is not None and current >= len(per_code):
+                current = None
+            codes = [c for c, n in enumerate(per_code) if n or c == current]
+            codes.sort(key=lambda c: (-per_code[c], labels[c].casefold()))
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem(self._(f"facet_all_{facet}").format(count=total), None)
+            for code in codes:
+                label = labels[code] or self._("facet_unknown")
+                combo.addItem(f"{label} ({per_code[code]})", code)
+            combo.setCurrentIndex(max(0, combo.findData(current)) if current is not None else 0)
+            combo.blockSignals(False)
+
+    def on_search_index_ready(self):
+        # Re-run an active query so it is ranked by the now complete index
+        if self.search_input.text().strip():
+            self.filter_wallpapers(self.search_input.text())
 
     def on_property_selected(self):
         data = self.properties_combo.currentData()
@@ -751,7 +1856,7 @@ class WallpaperApp(QMainWindow):
             return
         name = data.get("name", "")
         stored = self.properties_data.get(name, data)
-        self.properties_type.setText(stored.get("type", ""))
+        self.properties_type.setText(describe_property(stored))
         self.properties_value.blockSignals(True)
         self.properties_value.setText(stored.get("value", ""))
         self.properties_value.blockSignals(False)
@@ -767,7 +1872,7 @@ class WallpaperApp(QMainWindow):
             self.properties_data[name] = data
         idx = self.properties_combo.currentIndex()
         self.properties_combo.setItemData(idx, data)
-        self.run_wallpaper()
+        self.schedule_launch()
 
     def populate_properties_combo(self, props_dict):
         self.properties_combo.blockSignals(True)
@@ -781,6 +1886,9 @@ class WallpaperApp(QMainWindow):
                 "sep": data.get("sep", "="),
                 "type": data.get("type", ""),
             }
+            for key in ("text", "min", "max", "step", "options"):
+                if key in data:
+                    item[key] = data[key]
             self.properties_data[name] = item
             self.properties_combo.addItem(name, item)
         self.properties_combo.setCurrentIndex(0)
@@ -829,28 +1937,11 @@ class WallpaperApp(QMainWindow):
                     return props
 
         lines = output.splitlines()
-        current_name = None
-        current_type = ""
+        parser = ListingParser()
         for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
-            if stripped.startswith("_") or " - " in stripped:
-                parts = stripped.split(" - ", 1)
-                if parts:
-                    current_name = parts[0].strip()
-                    current_type = parts[1].strip() if len(parts) > 1 else ""
-                continue
-            if stripped.startswith("Value:"):
-                if current_name:
-                    value = stripped.split("Value:", 1)[1].strip()
-                    props.append((current_name, value, "=", current_type))
-                    current_name = None
-                    current_type = ""
-                continue
-
-        if props:
-            return props
+            parser.feed(line)
+        if parser.props:
+            return parser.props
 
         for line in lines:
             line = line.strip()
@@ -880,27 +1971,52 @@ class WallpaperApp(QMainWindow):
                 props.append((name, value, sep, ""))
         return props
 
-    def list_properties_logic(self, wallpaper_id):
+    def list_properties_logic(self, wallpaper_id, on_property=None):
         cmd = ["linux-wallpaperengine", "-l", wallpaper_id]
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        timed_out = False
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
         try:
-            stdout, stderr = proc.communicate(timeout=5)
-        except subprocess.TimeoutExpired:
-            timed_out = True
-            proc.terminate()
-            stdout, stderr = proc.communicate(timeout=2)
-        returncode = proc.returncode if proc.returncode is not None else 0
-        combined = (stdout or "")
-        if stderr:
-            combined = (combined + "\n" + stderr).strip()
-        return returncode, combined, stderr or "", timed_out, wallpaper_id
+            output, props, state = read_listing(proc, on_property)
+        finally:
+            if proc.poll() is None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+        if state == LISTING_COMPLETE:
+            # Stopped by us once the listing was done, not a failure
+            returncode = 0
+        else:
+            returncode = proc.returncode if proc.returncode is not None else 0
+        timed_out = state == LISTING_TIMEOUT
+        logging.info("Property probe for %s: %s, %d properties", wallpaper_id, state, len(props))
+        return returncode, output, output if returncode else "", timed_out, wallpaper_id, props
+
+    def project_dir_for(self, wallpaper_id):
+        if os.path.isdir(wallpaper_id):
+            return wallpaper_id
+        row = self.wallpaper_model.rows_by_id.get(wallpaper_id)
+        if row is None:
+            return None
+        return self.wallpaper_model.wallpaper_at(row)["path"]
 
     def load_properties(self):
         wallpaper_id = self.wp_id_input.text().strip()
         if not wallpaper_id:
             self.status_bar.showMessage(self._("status_error_empty_id"))
             return
+        item_dir = self.project_dir_for(wallpaper_id)
+        if item_dir:
+            props = self.property_cache.listing(wallpaper_id, item_dir)
+            self.property_cache.save()
+        else:
+            props = self.property_cache.get(wallpaper_id)
+        if props is not None:
+            self.show_loaded_properties(wallpaper_id, props)
+            return
+        # Only wallpapers outside the library need the backend to list them
+        logging.info("No project.json for %s, asking the backend", wallpaper_id)
         if not shutil.which("linux-wallpaperengine"):
             self.status_bar.showMessage("Error: linux-wallpaperengine not found")
             return
@@ -908,6 +2024,11 @@ class WallpaperApp(QMainWindow):
         self.btn_load_props.setEnabled(False)
         self.props_thread = QThread()
         self.props_worker = Worker(self.list_properties_logic, wallpaper_id)
+        # Properties are streamed to the combo while the probe is running
+        self.props_worker.kwargs["on_property"] = self.props_worker.progress.emit
+        self.props_worker.progress.connect(self.on_property_streamed)
+        self.populate_properties_combo({})
+        self.properties_streaming_for = wallpaper_id
         self.props_worker.moveToThread(self.props_thread)
         self.props_thread.started.connect(self.props_worker.run)
         self.props_worker.finished.connect(self.load_properties_finished)
@@ -917,21 +2038,59 @@ class WallpaperApp(QMainWindow):
         self.props_thread.start()
 
     def load_properties_finished(self, result):
-        returncode, stdout, stderr, timed_out, wallpaper_id = result
+        returncode, stdout, stderr, timed_out, wallpaper_id, streamed = result
+        self.properties_streaming_for = None
         self.btn_load_props.setEnabled(True)
         if returncode != 0 and not timed_out:
             msg = stderr.strip() or "Unknown error"
             self.status_bar.showMessage(self._("status_properties_load_failed").format(error=msg))
             return
-        props = self.parse_properties_output(stdout)
+        props = [{"name": name, "value": value, "sep": sep, "type": prop_type}
+                 for name, value, sep, prop_type in streamed or self.parse_properties_output(stdout)]
+        if props and not timed_out:
+            self.property_cache.put(wallpaper_id, None, props)
+            self.property_cache.save()
+        self.show_loaded_properties(wallpaper_id, props, timed_out)
+
+    def on_property_streamed(self, prop):
+        wallpaper_id = self.properties_streaming_for
+        if wallpaper_id != self.wp_id_input.text().strip():
+            return
+        name, value, sep, prop_type = prop
+        stored = self.config.get("properties_by_wallpaper", {}).get(wallpaper_id, {})
+        data = {"name": name, "value": stored.get(name, {}).get("value", value),
+                "sep": sep, "type": prop_type}
+        self.properties_data[name] = data
+        self.properties_combo.addItem(name, data)
+        self.status_bar.showMessage(self._("status_properties_streaming").format(count=len(self.properties_data)))
+
+    def show_cached_properties(self):
+        """Fill the properties combo from the listing cache, if it has one."""
+        wallpaper_id = self.wp_id_input.text().strip()
+        if not wallpaper_id or self.properties_listed_for == wallpaper_id:
+            return True
+        props = self.property_cache.get(wallpaper_id, self.project_dir_for(wallpaper_id))
+        if props is None:
+            return False
+        self.show_loaded_properties(wallpaper_id, props, announce=False)
+        return True
+
+    def on_property_listing_ready(self, wallpaper_id):
+        if wallpaper_id == self.wp_id_input.text().strip():
+            self.show_cached_properties()
+
+    def show_loaded_properties(self, wallpaper_id, props, timed_out=False, announce=True):
         stored = self.config.get("properties_by_wallpaper", {}).get(wallpaper_id, {})
         merged = {}
-        for name, value, sep, prop_type in props:
-            data = {"name": name, "value": value, "sep": sep, "type": prop_type}
+        for data in props:
+            name = data["name"]
             if name in stored:
-                data["value"] = stored[name].get("value", value)
+                data["value"] = stored[name].get("value", data["value"])
             merged[name] = data
         self.populate_properties_combo(merged)
+        self.properties_listed_for = wallpaper_id
+        if not announce:
+            return
         if props:
             if timed_out:
                 self.status_bar.showMessage(self._("status_properties_loaded_timeout").format(count=len(props)))
@@ -946,6 +2105,17 @@ class WallpaperApp(QMainWindow):
     def kill_external_wallpapers(self):
         self.wallpaper_proc_manager.kill_external("linux-wallpaperengine")
 
+    def apply_wallpaper(self, *args):
+        """Set the wallpaper on an explicit user request.
+
+        Setting a wallpaper by hand means the user wants to see it, even
+        when it is the one already running, so a manual pause ends here.
+        Launches coalesced from settings changes go straight to
+        run_wallpaper() and leave the pause alone.
+        """
+        self.a_pause.setChecked(False)
+        self.run_wallpaper()
+
     def run_wallpaper(self):
         if not shutil.which("linux-wallpaperengine"):
             from PyQt6.QtWidgets import QMessageBox
@@ -955,101 +2125,425 @@ class WallpaperApp(QMainWindow):
             self.status_bar.showMessage("Error: linux-wallpaperengine not found")
             return
 
-        cmd = ['linux-wallpaperengine']
+        self.launch_timer.stop()
+        requested_at = time.monotonic()
         screen_name = self.screen_combo.currentText()
+        cmd = self.build_wallpaper_command(screen_name)
+        self.config["scale"] = self.combo_scaling.currentText()
+        self.config["clamp"] = self.combo_clamp.currentText()
+        effective = self.governed_command(cmd)
+        if self.wallpaper_proc_manager.current_command(screen_name) == effective:
+            logging.info("Launch on %s skipped, command unchanged", screen_name)
+            self.status_bar.showMessage(self._("status_launch_unchanged"))
+            return
+        if not self.wallpaper_proc_manager.is_running():
+            # Nothing of ours is running, so anything left is an orphan of
+            # an earlier session; other screens' processes are never touched.
+            self.kill_external_wallpapers()
+        self.cancel_restart(screen_name)
+        self.start_backend(effective, screen_name, handoff=self.chk_handoff.isChecked(),
+                           requested_at=requested_at)
+        self.status_bar.showMessage(self._("status_command_launched"))
+        self.config.setdefault("wallpapers_by_screen", {})[screen_name] = {
+            "settings": self.current_wallpaper_settings(),
+            "cmd": cmd,
+        }
+        self.save_config()
 
+    def launch_options(self, screen_name):
+        """Snapshot of everything on the Control page that affects the launch."""
+        geometry = None
         if self.chk_windowed_mode.isChecked():
-            geom = "0x0x1920x1080"
+            geometry = "0x0x1920x1080"
             found = next((s for s in self.screens if s["name"] == screen_name), None)
             if found:
-                geom = f"{found['x']}x{found['y']}x{found['w']}x{found['h']}"
-            cmd.extend(['--window', geom])
+                geometry = f"{found['x']}x{found['y']}x{found['w']}x{found['h']}"
+        return {
+            "screen": screen_name,
+            "window": geometry,
+            "background": self.wp_id_input.text(),
+            "silent": self.chk_silent.isChecked(),
+            "volume": self.slider_volume.value(),
+            "noautomute": self.chk_no_automute.isChecked(),
+            "no_audio_processing": self.chk_no_proc.isChecked(),
+            "fps": self.slider_fps.value(),
+            "disable_mouse": self.chk_mouse.isChecked(),
+            "disable_parallax": self.chk_parallax.isChecked(),
+            "no_fullscreen_pause": self.chk_fs_pause.isChecked(),
+            "scaling": self.combo_scaling.currentText(),
+            "clamp": self.combo_clamp.currentText(),
+            "properties": [(name, data.get("sep", "="),
+                            self.normalize_property_value(str(data.get("value", ""))))
+                           for name, data in self.properties_data.items()],
+            "custom_args": self.input_custom_args.text(),
+        }
+
+    def build_wallpaper_command(self, screen_name):
+        return build_backend_command(self.launch_options(screen_name))
+
+    def schedule_launch(self, *args):
+        # Bursts of changes (several toggles, a slider drag) end in one launch
+        self.launch_timer.start()
+
+    def run_backend_op(self, coro, screen=None, on_done=None):
+        """Run a process manager coroutine without blocking the window.
+
+        on_done gets the coroutine's result. Operations cancelled because a
+        newer start or stop on the same screen superseded them are dropped.
+        """
+        def finished(task):
+            if task.cancelled():
+                return
+            error = task.exception()
+            if error is not None:
+                logging.error("Backend operation on %s failed: %s", screen or "all screens", error)
+                self.status_bar.showMessage(f"Error: {error}")
+            elif on_done is not None:
+                on_done(task.result())
+            self.update_screen_status()
+        return self.async_loop.submit(coro, finished)
+
+    def on_backend_started(self, screen):
+        if not self.wallpaper_proc_manager.is_running(screen):
+            return
+        self.handoff_timer.start()
+        if self.pause_reasons:
+            self.wallpaper_proc_manager.pause(screen)
+
+    def start_backend(self, cmd, screen, handoff=False, requested_at=None):
+        aio = self.wallpaper_proc_manager.aio
+        return self.run_backend_op(aio.start(cmd, screen, handoff=handoff, requested_at=requested_at),
+                                   screen, lambda proc: self.on_backend_started(screen))
+
+    def restart_backend(self, screen, handoff=False, on_missing=None):
+        def restarted(proc):
+            if proc is None:
+                if on_missing is not None:
+                    on_missing()
+                return
+            self.on_backend_started(screen)
+        return self.run_backend_op(self.wallpaper_proc_manager.aio.restart(screen, handoff=handoff),
+                                   screen, restarted)
+
+    def restart_screen(self):
+        screen_name = self.screen_combo.currentText()
+        self.restart_backend(screen_name, handoff=self.chk_handoff.isChecked(), on_missing=self.run_wallpaper)
+        self.status_bar.showMessage(self._("status_command_launched"))
+
+    def set_pause_reason(self, reason, active):
+        if active:
+            self.pause_reasons.add(reason)
         else:
-            cmd.extend(['--screen-root', screen_name])
-
-        cmd.extend(['--bg', self.wp_id_input.text()])
-        if self.chk_silent.isChecked(): cmd.append('--silent')
-        elif self.slider_volume.value() != 15: cmd.extend(['--volume', str(self.slider_volume.value())])
-        if self.chk_no_automute.isChecked(): cmd.append('--noautomute')
-        if self.chk_no_proc.isChecked(): cmd.append('--no-audio-processing')
-        if self.slider_fps.value() != 30: cmd.extend(['--fps', str(self.slider_fps.value())])
-        if self.chk_mouse.isChecked(): cmd.append('--disable-mouse')
-        if self.chk_parallax.isChecked(): cmd.append('--disable-parallax')
-        if self.chk_fs_pause.isChecked(): cmd.append('--no-fullscreen-pause')
-        scale = self.combo_scaling.currentText()
-        self.config["scale"] = scale
-        if scale != 'default': cmd.extend(['--scaling', scale])
-        clamp = self.combo_clamp.currentText()
-        self.config["clamp"] = clamp
-        if clamp != 'clamp': cmd.extend(['--clamp', clamp])
-        if hasattr(self, "properties_data"):
-            for name, data in self.properties_data.items():
-                value = self.normalize_property_value(str(data.get("value", "")))
-                sep = data.get("sep", "=")
-                cmd.extend(['--set-property', f"{name}{sep}{value}"])
-        custom_args = self.input_custom_args.text()
-        if custom_args:
-             for arg in custom_args.split(): cmd.append(arg)
-        self.stop_wallpapers()
+            self.pause_reasons.discard(reason)
+        if self.pause_reasons:
+            paused = self.wallpaper_proc_manager.pause()
+        else:
+            paused = self.wallpaper_proc_manager.resume()
+        if paused:
+            logging.info("%s %s (%s)", "Paused" if self.pause_reasons else "Resumed",
+                         ", ".join(paused), ", ".join(sorted(self.pause_reasons)) or reason)
+        self.update_screen_status()
+
+    def governed_command(self, cmd):
+        """Apply the FPS governor's current cap to a user launch command."""
+        if not self.chk_fps_governor.isChecked():
+            return list(cmd)
+        return with_fps(cmd, self.fps_governor.cap)
+
+    def on_fps_governor_toggled(self, checked):
+        self.config["fps_governor"] = checked
+        self.save_config()
+        if checked:
+            self.governor_timer.start()
+            self.run_fps_governor()
+        else:
+            self.governor_timer.stop()
+            self.apply_fps_cap()
+
+    def run_fps_governor(self):
+        saved = self.config.get("wallpapers_by_screen", {})
+        backend_cpu = None
+        for status in self.wallpaper_proc_manager.statuses():
+            res = status["resources"]
+            entry = saved.get(status["screen"])
+            running = self.wallpaper_proc_manager.current_command(status["screen"])
+            if not res or res["cpu_percent"] is None or not entry or not running:
+                continue
+            # Scale to what the backend would use at the FPS the user asked for
+            ratio = command_fps(entry["cmd"]) / command_fps(running)
+            backend_cpu = (backend_cpu or 0.0) + res["cpu_percent"] * ratio
+        if self.fps_governor.evaluate(backend_cpu):
+            self.apply_fps_cap()
+
+    def apply_fps_cap(self):
+        """Relaunch every screen whose governed command changed."""
+        for screen, entry in self.config.get("wallpapers_by_screen", {}).items():
+            current = self.wallpaper_proc_manager.current_command(screen)
+            if current is None or not entry.get("cmd"):
+                continue
+            cmd = self.governed_command(entry["cmd"])
+            if cmd == current:
+                continue
+            self.start_backend(cmd, screen, handoff=self.chk_handoff.isChecked())
+
+    def limit_profiles(self):
+        """Built-in launch limit profiles plus the ones defined in the config."""
+        profiles = dict(DEFAULT_PROFILES)
+        profiles.update(self.config.get("limit_profiles", {}))
+        return profiles
+
+    def apply_limit_profile(self):
+        name = self.combo_limits.currentData()
+        limits = self.limit_profiles().get(name, {})
+        if (self.scope_probe is None and user_scope_available() is None
+                and ("cpu_quota" in limits or "memory_max" in limits)):
+            # Probing for systemd user scopes can block for seconds; apply
+            # the profile again once it has answered.
+            self.scope_probe = self.async_loop.submit(asyncio.to_thread(probe_user_scope),
+                                   lambda task: self.apply_limit_profile())
+        problems = self.wallpaper_proc_manager.set_limits(limits)
+        if problems:
+            msg = self._("status_limits_fallback").format(details="; ".join(problems))
+            self.status_bar.showMessage(msg)
+            if hasattr(self, "tray") and self.tray.isVisible():
+                self.tray.showMessage("Wallpaper Engine", msg)
+        return problems
+
+    def on_limit_profile_changed(self):
+        self.config["limit_profile"] = self.combo_limits.currentData()
+        self.save_config()
+        self.apply_limit_profile()
+        # The limits only take effect on launch, so relaunch what runs
+        for status in self.wallpaper_proc_manager.statuses():
+            if status["running"]:
+                self.restart_backend(status["screen"], handoff=self.chk_handoff.isChecked())
+
+    def on_handoff_toggled(self, checked):
+        self.config["handoff_launch"] = checked
+        self.save_config()
+
+    def check_wallpaper_ready(self):
+        for record in self.wallpaper_proc_manager.poll_ready():
+            logging.info("Backend on %s ready after %.0f ms (gap %s, handoff %s%s)",
+                         record["screen"], record["ready_ms"],
+                         "n/a" if record["gap_ms"] is None else f"{record['gap_ms']:.0f} ms",
+                         record["handoff"], ", assumed" if record["timed_out"] else "")
+            if record["gap_ms"] is not None:
+                self.status_bar.showMessage(self._("status_swap_done").format(
+                    screen=record["screen"], ready=round(record["ready_ms"]), gap=round(record["gap_ms"])))
+            entry = self.config.get("wallpapers_by_screen", {}).get(record["screen"], {})
+            cmd = record["cmd"]
+            wallpaper = cmd[cmd.index("--bg") + 1] if "--bg" in cmd[:-1] else None
+            self.launch_history.add(record, wallpaper, entry.get("settings"))
+            self.launch_history.save()
+            self.update_launch_stats()
+        if not self.wallpaper_proc_manager.awaiting_ready():
+            self.handoff_timer.stop()
+
+    def sample_resources(self):
+        self.wallpaper_proc_manager.sample()
+        lines = []
+        for status in self.wallpaper_proc_manager.statuses():
+            res = status["resources"]
+            if res is None:
+                continue
+            cpu = "–" if res["cpu_percent"] is None else f"{res['cpu_percent']:.1f}"
+            if res["read_rate"] is None:
+                io = "–"
+            else:
+                io = f"{res['read_rate'] / 1024:.0f}/{res['write_rate'] / 1024:.0f}"
+            lines.append(self._("resource_readout").format(
+                screen=status["screen"], cpu=cpu, rss=res["rss"] // (1024 * 1024),
+                threads=res["threads"], io=io))
+        if self.chk_fps_governor.isChecked() and self.fps_governor.cap is not None:
+            lines.append(self._("fps_cap_readout").format(
+                fps=self.fps_governor.cap, reasons=", ".join(self.fps_governor.reasons)))
+        text = "\n".join(lines)
+        self.lbl_resource_stats.setText(text)
+        if hasattr(self, "tray"):
+            self.tray.setToolTip("\n".join([self._("app_title"), *lines]))
+        if not self.wallpaper_proc_manager.is_running():
+            # The readout above is cleared; nothing to sample until a spawn
+            self.stats_timer.stop()
+
+    def update_launch_stats(self):
+        count, (p50, p95) = self.launch_history.percentiles("total")
+        if not count:
+            self.lbl_launch_stats.setText("")
+            return
+        self.lbl_launch_stats.setText(self._("launch_stats_readout").format(
+            p50=round(p50), p95=round(p95), count=count))
+
+    def export_launch_history(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, self._("export_launches_button"), "wallpaper-launches.csv", "CSV (*.csv)")
+        if not path:
+            return
         try:
-            self.wallpaper_proc_manager.start(cmd)
-            self.status_bar.showMessage(self._("status_command_launched"))
-            self.save_config()
+            count = self.launch_history.export_csv(path)
+            self.status_bar.showMessage(self._("status_launches_exported").format(count=count, path=path))
         except Exception as e:
-            logging.error("Couldn't run with error %s", e)
+            logging.error("Failed to export launch history: %s", e)
             self.status_bar.showMessage(f"Error: {e}")
 
+    def update_screen_status(self):
+        lines = []
+        for status in self.wallpaper_proc_manager.statuses():
+            if status["running"] and status["paused"]:
+                lines.append(self._("screen_status_paused").format(screen=status["screen"], pid=status["pid"]))
+            elif status["running"] and status["last_crash"]:
+                lines.append(self._("screen_status_running_crashed").format(
+                    screen=status["screen"], pid=status["pid"], restarts=status["restarts"],
+                    reason=self.exit_reason(status["last_crash"]["returncode"]),
+                    time=time.strftime("%H:%M:%S", time.localtime(status["last_crash"]["time"]))))
+            elif status["running"]:
+                lines.append(self._("screen_status_running").format(
+                    screen=status["screen"], pid=status["pid"], restarts=status["restarts"]))
+            elif status["crash_loop"]:
+                lines.append(self._("screen_status_crash_loop").format(
+                    screen=status["screen"], count=status["crashes"], window=round(CRASH_LOOP_WINDOW),
+                    reason=self.exit_reason(status["last_exit"]["returncode"])))
+            elif status["screen"] in self.pending_restarts:
+                lines.append(self._("screen_status_restarting").format(
+                    screen=status["screen"], reason=self.exit_reason(status["last_exit"]["returncode"]),
+                    delay=f"{self.pending_restarts[status['screen']][1]:g}", restarts=status["restarts"]))
+            elif status["last_exit"] and not status["last_exit"]["expected"]:
+                lines.append(self._("screen_status_exited").format(
+                    screen=status["screen"], code=status["last_exit"]["returncode"]))
+            else:
+                lines.append(self._("screen_status_stopped").format(screen=status["screen"]))
+        self.lbl_screen_status.setText("\n".join(lines))
+
     def show_log_file(self):
-        log_path = self.wallpaper_proc_manager.log_path()
+        screen_name = self.screen_combo.currentText()
+        if self.wallpaper_proc_manager.is_running(screen_name):
+            log_path = self.wallpaper_proc_manager.log_path(screen_name)
+        else:
+            log_path = self.wallpaper_proc_manager.log_path()
         if not log_path.exists():
             self.status_bar.showMessage("Log file not found.")
             return
         QDesktopServices.openUrl(QUrl.fromLocalFile(str(log_path)))
 
     def stop_wallpapers(self):
-        stopped_internal = False
-        if self.wallpaper_proc_manager.is_running():
-            try:
-                stopped_internal = self.wallpaper_proc_manager.stop(timeout=1)
-            except Exception as e:
-                logging.error("Couldn't stop internal wallpaper process: %s", e)
-
-        # Fallback: If we didn't stop a child process (e.g. GUI restarted),
-        # ensure we clean up any orphaned linux-wallpaperengine processes.
-        # This restores the "force stop" capability users expect.
-        if not stopped_internal:
-            self.kill_external_wallpapers()
-            self.status_bar.showMessage(self._("status_all_stopped"))
-        else:
+        for screen in list(self.pending_restarts):
+            self.cancel_restart(screen)
+
+        def stopped(stopped_internal):
+            # Fallback: If we didn't stop a child process (e.g. GUI restarted),
+            # ensure we clean up any orphaned linux-wallpaperengine processes.
+            # This restores the "force stop" capability users expect.
+            if not stopped_internal:
+                self.kill_external_wallpapers()
             self.status_bar.showMessage(self._("status_all_stopped"))
 
-    def check_wallpaper_process(self):
-        result = self.wallpaper_proc_manager.check()
-        if result is None:
+        # Also supersedes launches still waiting for an old backend to exit
+        self.run_backend_op(self.wallpaper_proc_manager.aio.stop(timeout=1), on_done=stopped)
+
+    def watch_backend(self, proc):
+        if not self.stats_timer.isActive():
+            self.stats_timer.start()
+        if not self.exit_watcher.watch(proc) and not self.wallpaper_watchdog.isActive():
+            self.wallpaper_watchdog.start()
+
+    def exit_reason(self, returncode):
+        name = exit_signal(returncode)
+        if name:
+            return self._("exit_reason_signal").format(signal=name)
+        return self._("exit_reason_code").format(code=returncode)
+
+    def schedule_restart(self, screen, delay):
+        self.cancel_restart(screen)
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self.auto_restart(screen))
+        timer.start(int(delay * 1000))
+        self.pending_restarts[screen] = (timer, delay)
+
+    def cancel_restart(self, screen):
+        pending = self.pending_restarts.pop(screen, None)
+        if pending is not None:
+            pending[0].stop()
+            pending[0].deleteLater()
+
+    def auto_restart(self, screen):
+        self.cancel_restart(screen)
+        if self.wallpaper_proc_manager.is_running(screen):
             return
-        if result["expected"]:
+        self.restart_backend(screen)
+
+    def check_wallpaper_process(self):
+        results = self.wallpaper_proc_manager.check()
+        if not results:
             return
-        returncode = result["returncode"]
-        if returncode == 0:
-            msg = "Wallpaper process exited."
-        else:
-            msg = f"Wallpaper process crashed (code {returncode})."
-        if result["log_path"]:
-            msg = f"{msg} Log: {result['log_path']}"
-        self.status_bar.showMessage(msg)
-        if hasattr(self, "tray") and self.tray.isVisible():
-            self.tray.showMessage("Wallpaper Engine", msg)
+        for result in results:
+            if result["expected"]:
+                continue
+            returncode = result["returncode"]
+            screen = result["screen"]
+            logging.warning("Backend on %s ended unexpectedly: %s", screen, describe_exit(returncode))
+            if returncode == 0:
+                msg = self._("crash_exited").format(screen=screen)
+            else:
+                msg = self._("crash_crashed").format(screen=screen, reason=self.exit_reason(returncode))
+            if result["swap_aborted"]:
+                msg = f"{msg} {self._('crash_kept_previous')}"
+            elif result["restart_delay"] is not None and self.config.get("auto_restart", True):
+                self.schedule_restart(screen, result["restart_delay"])
+                delay = format(result["restart_delay"], "g")
+                msg = f"{msg} {self._('crash_restarting').format(delay=delay)}"
+            elif result["restart_delay"] is None:
+                msg = f"{msg} {self._('crash_not_restarting')}"
+            if result["log_path"]:
+                msg = f"{msg} {self._('crash_log_path').format(path=result['log_path'])}"
+            self.status_bar.showMessage(msg)
+            if hasattr(self, "tray") and self.tray.isVisible():
+                self.tray.showMessage("Wallpaper Engine", msg)
+        self.update_screen_status()
+
+    def current_wallpaper_settings(self):
+        return {
+            "background_id": self.wp_id_input.text(),
+            "screen": self.screen_combo.currentText(),
+            "silent": self.chk_silent.isChecked(),
+            "volume": self.slider_volume.value(),
+            "custom_args": self.input_custom_args.text(),
+            "windowed_mode": self.chk_windowed_mode.isChecked()
+        }
 
-    def restore_last_wallpaper(self):
-        c = self.config.get("last_wallpaper", {})
-        if not c: return
+    def apply_wallpaper_settings(self, c):
         self.wp_id_input.setText(c.get("background_id", ""))
-        self.screen_combo.setCurrentText(c.get("screen", ""))
         self.chk_silent.setChecked(c.get("silent", False))
         self.slider_volume.setValue(c.get("volume", 15))
         self.input_custom_args.setText(c.get("custom_args", ""))
         self.chk_windowed_mode.setChecked(c.get("windowed_mode", False))
+
+    def on_screen_changed(self, screen_name):
+        # Show what is set on the chosen screen without relaunching anything
+        entry = self.config.get("wallpapers_by_screen", {}).get(screen_name)
+        if entry and not self.restoring_screens:
+            self.apply_wallpaper_settings(entry.get("settings", {}))
+
+    def restore_last_wallpaper(self):
+        c = self.config.get("last_wallpaper", {})
+        if not c: return
+        self.restoring_screens = True
+        self.screen_combo.setCurrentText(c.get("screen", ""))
+        self.restoring_screens = False
+        self.apply_wallpaper_settings(c)
         self.run_wallpaper()
+        # Other screens are relaunched from their saved commands, one at a
+        # time so their backends do not hit the disk all at once.
+        others = [(screen, entry) for screen, entry in self.config.get("wallpapers_by_screen", {}).items()
+                  if screen != c.get("screen", "") and entry.get("cmd")]
+        for i, (screen, entry) in enumerate(others, 1):
+            QTimer.singleShot(int(i * COLD_START_STAGGER * 1000),
+                              lambda screen=screen, cmd=entry["cmd"]: self.start_saved_screen(screen, cmd))
+
+    def start_saved_screen(self, screen, cmd):
+        if self.wallpaper_proc_manager.is_running(screen):
+            return
+        self.start_backend(self.governed_command(cmd), screen)
 
     def detect_screens(self):
         screens = []
@@ -1107,18 +2601,17 @@ class WallpaperApp(QMainWindow):
 
     def on_wallpaper_id_changed(self):
         wallpaper_id = self.wp_id_input.text().strip()
+        self.properties_listed_for = None
+        if wallpaper_id and self.show_cached_properties():
+            return
         stored = self.config.get("properties_by_wallpaper", {}).get(wallpaper_id, {})
         self.populate_properties_combo(stored)
+        item_dir = self.project_dir_for(wallpaper_id) if wallpaper_id else None
+        if item_dir:
+            self.property_prefetcher.prefetch(wallpaper_id, item_dir)
 
     def save_config(self):
-        self.config["last_wallpaper"] = {
-            "background_id": self.wp_id_input.text(),
-            "screen": self.screen_combo.currentText(),
-            "silent": self.chk_silent.isChecked(),
-            "volume": self.slider_volume.value(),
-            "custom_args": self.input_custom_args.text(),
-            "windowed_mode": self.chk_windowed_mode.isChecked()
-        }
+        self.config["last_wallpaper"] = self.current_wallpaper_settings()
         wallpaper_id = self.wp_id_input.text().strip()
         if wallpaper_id:
             props_out = {}
@@ -1152,9 +2645,13 @@ class WallpaperApp(QMainWindow):
         self.tray_menu = QMenu()
         a_show = QAction(self._("show_window_tray_menu"), self)
         a_show.triggered.connect(self.show)
+        self.a_pause = QAction(self._("pause_tray_menu"), self)
+        self.a_pause.setCheckable(True)
+        self.a_pause.toggled.connect(lambda on: self.set_pause_reason("manual", on))
         a_exit = QAction(self._("exit_tray_menu"), self)
         a_exit.triggered.connect(self.quit_app)
         self.tray_menu.addAction(a_show)
+        self.tray_menu.addAction(self.a_pause)
         self.tray_menu.addAction(a_exit)
 
         self.tray.setContextMenu(self.tray_menu)
@@ -1169,9 +2666,22 @@ class WallpaperApp(QMainWindow):
 
     def quit_app(self):
         logging.info("Exiting application...")
-        self.stop_wallpapers()
+        # Nothing is left to show the result of pending launches; cancel
+        # them and stop the backends before the process exits.
+        self.async_loop.close()
+        try:
+            self.wallpaper_proc_manager.stop(timeout=1)
+        except Exception as e:
+            logging.error("Couldn't stop internal wallpaper process: %s", e)
         if hasattr(self, 'watcher'):
             self.watcher.stop()
+        logging.info("Card cache: %s", self.list_wallpapers.itemDelegate().cache_stats())
+        self.thumbnail_loader.cancel_all()
+        self.thumbnail_loader.pool.waitForDone(1000)
+        self.thumbnail_cache.close()
+        self.property_prefetcher.pool.waitForDone(1000)
+        self.property_cache.save()
+        self.launch_history.save()
 
         # Force kill any remaining backend processes to ensure clean exit
         self.kill_external_wallpapers()